@@ -1,17 +1,24 @@
-import pandas as pd
-import re
+import numpy as np
+import os, re, json, hashlib, threading
 from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from scipy import sparse
+import store, count_index, catalog
 
 
+# cleaning patterns, compiled once
+NOT_LETTERS = re.compile(r'[^a-z\s-]')
+SPACES = re.compile(r'\s+')
+
 # removes numbers and punctuation of words in "review" column of csv
 def clean_text(text):
     text = str(text).lower()  
     
     # keep letters, spaces, and hyphens (remove numbers & punctuation only)
-    text = re.sub(r'[^a-z\s-]', '', text)  
+    text = NOT_LETTERS.sub('', text)  
     
     # normalize multiple spaces
-    text = re.sub(r'\s+', ' ', text).strip()
+    text = SPACES.sub(' ', text).strip()
     
     return text
 
@@ -223,56 +230,255 @@ pattern_words = {
 }
 
 
-# gets counts for all words in a category (color, fabric, etc.)
-def get_counts(review):
-    review_lst = review.split()
-
-    # creates keywords dictionary for easy looping
-    keywords = {'colors': color_words, 'fabrics': fabric_words, 'silhouettes': silhouette_words, 
-                'pieces': piece_words, 'patterns': pattern_words, 'details': details_words}
-    
-    counts = {}
-
-    # iterates over every keywords collection
-    for name, category in keywords.items():
-
-        # counts num of words mentioned in each keyword group
-        num = Counter([word for word in review_lst if word in category])
-
-        # adds to counts dictionary for each word
-        counts[name] = num
-
+# creates keywords dictionary for easy looping
+KEYWORDS = {'colors': color_words, 'fabrics': fabric_words, 'silhouettes': silhouette_words,
+            'pieces': piece_words, 'patterns': pattern_words, 'details': details_words}
+
+# every keyword phrase once, in a stable order; these are the count matrix columns
+VOCABULARY = sorted({word for words in KEYWORDS.values() for word in words if word.split()})
+TERM_INDEX = {term: i for i, term in enumerate(VOCABULARY)}
+
+# changes whenever a keyword set is edited, which invalidates saved count indexes
+VOCABULARY_HASH = hashlib.sha256(
+    json.dumps({name: sorted(words) for name, words in KEYWORDS.items()}, sort_keys=True).encode()).hexdigest()
+
+# categories each column belongs to, and the columns of each category
+TERM_CATEGORIES = [tuple(name for name, words in KEYWORDS.items() if term in words) for term in VOCABULARY]
+CATEGORY_COLUMNS = {name: np.array(sorted(TERM_INDEX[word] for word in words if word.split()), dtype=np.intp)
+                    for name, words in KEYWORDS.items()}
+
+# builds a token trie over every keyword phrase (multi-word ones included).
+# each node maps a token to [child node, column of the phrase ending on that token or None]
+def build_keyword_trie(terms=VOCABULARY):
+    trie = {}
+    for column, term in enumerate(terms):
+        tokens = term.split()
+        node = trie
+        for i, token in enumerate(tokens):
+            entry = node.setdefault(token, [{}, None])
+            if i == len(tokens) - 1:
+                entry[1] = column
+            node = entry[0]
+    return trie
+
+KEYWORD_TRIE = build_keyword_trie()
+
+# finds every keyword phrase in a token list in one scan and returns their columns.
+# phrases are matched wherever they start, so 'dusty pink' yields both 'dusty pink' and 'pink'.
+def match_columns(tokens):
+    n = len(tokens)
+    hits = []
+
+    for i in range(n):
+        entry = KEYWORD_TRIE.get(tokens[i])
+        j = i
+
+        # follows the trie while the next tokens keep extending a phrase
+        while entry is not None:
+            if entry[1] is not None:
+                hits.append(entry[1])
+            j += 1
+            if j == n:
+                break
+            entry = entry[0].get(tokens[j])
+
+    return hits
+
+# turns a Counter of matrix columns into the {category: Counter} layout of get_counts
+def counts_from_columns(column_counts):
+    counts = {name: Counter() for name in KEYWORDS}
+    for column, num in column_counts.items():
+        for name in TERM_CATEGORIES[column]:
+            counts[name][VOCABULARY[column]] = num
     return counts
 
+# gets counts for all words and phrases in each category (color, fabric, etc.).
+# a phrase is counted in every category it belongs to.
+def get_counts(review):
+    return counts_from_columns(Counter(match_columns(review.split())))
+
+# sparse show x term count matrix for one season.
+# rows are shows (with their designer and token count), columns are VOCABULARY,
+# so season totals, per-designer counts and category slices are array reductions.
+class CountMatrix:
+    def __init__(self, matrix, designers, lengths):
+        self.matrix = sparse.csr_matrix(matrix, dtype=np.int32)
+        self.designers = np.asarray(designers, dtype=object)
+        self.lengths = np.asarray(lengths, dtype=np.int64)
+
+    @property
+    def shows(self):
+        return self.matrix.shape[0]
+
+    # mentions of every term, optionally restricted to some rows
+    def totals(self, rows=None):
+        matrix = self.matrix if rows is None else self.matrix[rows]
+        return np.asarray(matrix.sum(axis=0)).ravel()
+
+    # mentions of every term in one category, in CATEGORY_COLUMNS order
+    def category_totals(self, category, rows=None):
+        return self.totals(rows)[CATEGORY_COLUMNS[category]]
+
+    # Counter of the non-zero terms of one category
+    def category_counts(self, category, rows=None):
+        columns = CATEGORY_COLUMNS[category]
+        totals = self.totals(rows)[columns]
+        return Counter({VOCABULARY[c]: int(n) for c, n in zip(columns, totals) if n})
+
+    # the same {category: Counter} layout get_counts returns
+    def to_counts(self, rows=None):
+        totals = self.totals(rows)
+        counts = {}
+        for name, columns in CATEGORY_COLUMNS.items():
+            counts[name] = Counter({VOCABULARY[c]: int(totals[c]) for c in columns if totals[c]})
+        return counts
+
+    # counts for the shows of one designer
+    def designer_counts(self, designer):
+        return self.to_counts(np.flatnonzero(self.designers == designer))
+
+    # counts for every designer in the season
+    def by_designer(self):
+        return {designer: self.designer_counts(designer) for designer in dict.fromkeys(self.designers)}
+
+    # k most mentioned terms of a category as (term, count) pairs
+    def top_k(self, category, k=10, rows=None):
+        columns = CATEGORY_COLUMNS[category]
+        totals = self.totals(rows)[columns]
+        order = np.argsort(-totals, kind='stable')[:k]
+        return [(VOCABULARY[columns[i]], int(totals[i])) for i in order if totals[i]]
+
+# builds the count matrix for a list of cleaned reviews.
+# the reviews are scanned once and every hit goes into a single sparse constructor.
+def build_count_matrix(reviews, designers=None):
+    columns, row_sizes, lengths = [], [], []
+    for review in reviews:
+        tokens = str(review).split()
+        hits = match_columns(tokens)
+        columns.extend(hits)
+        row_sizes.append(len(hits))
+        lengths.append(len(tokens))
+
+    rows = np.repeat(np.arange(len(row_sizes)), row_sizes)
+    data = np.ones(len(columns), dtype=np.int32)
+    matrix = sparse.coo_matrix((data, (rows, np.asarray(columns, dtype=np.intp))),
+                               shape=(len(row_sizes), len(VOCABULARY)))
+
+    if designers is None:
+        designers = [''] * len(row_sizes)
+    return CountMatrix(matrix.tocsr(), designers, lengths)
+
+# running keyword counts for a season that is fed one review at a time
+class SeasonCounts:
+    def __init__(self):
+        self.counts = {name: Counter() for name in KEYWORDS}
+        self.shows = 0
+        self.lock = threading.Lock()
+
+    # counts one cleaned review into the running totals
+    def add(self, clean_review):
+        review_counts = get_counts(clean_review)
+        with self.lock:
+            for name, num in review_counts.items():
+                self.counts[name].update(num)
+            self.shows += 1
+
+    # copy of the current totals, safe to hand to another thread
+    def snapshot(self):
+        with self.lock:
+            return {name: Counter(num) for name, num in self.counts.items()}
+
+# reads the designers and cleaned reviews of a season (store or legacy csv).
+# only those columns are loaded; raw reviews are read and cleaned in memory
+# just for rows that were never cleaned (e.g. legacy csvs).
+def load_clean_reviews(season_path):
+    df = store.read_shows(season_path, columns=['Designer', 'Cleaned Review'])
+
+    missing = df['Cleaned Review'].isna()
+    if missing.any():
+        df['Cleaned Review'] = df['Cleaned Review'].astype(object)
+        raw = store.read_shows(season_path, columns=['Review'])['Review']
+        df.loc[missing, 'Cleaned Review'] = raw[missing].dropna().apply(clean_text)
+
+    return df.dropna(subset=['Cleaned Review'])
+
 # cleans up review text
 def get_clean_rev(csv_path):
-
-    # reads in review from csv
-    df = pd.read_csv(csv_path)
-
-    # changes review to cleaned review using clean_text function
-    df['Cleaned Review'] = df['Review'].apply(clean_text)
-
-    # saves updated dataframe with cleaned reviews back to same csv
-    df.to_csv(csv_path, index=False)
+    df = load_clean_reviews(csv_path)
 
     # creates text of clean review
-    clean_review = ' '.join([str(r) for r in df['Cleaned Review'].dropna()])
+    clean_review = ' '.join([str(r) for r in df['Cleaned Review']])
     return clean_review
 
-# used to analyze a single season
+# builds the per-show count matrix of a season
+def count_matrix_for_season(season_path):
+    df = load_clean_reviews(season_path)
+    return build_count_matrix(df['Cleaned Review'], df['Designer'])
+
+# cleans and counts a chunk of raw reviews; runs inside worker processes
+def count_review_chunk(reviews):
+    column_counts = Counter()
+    for review in reviews:
+        column_counts.update(match_columns(clean_text(review).split()))
+    return column_counts
+
+# keyword counts of one season, from its count index; runs inside worker processes
+def count_file(csv_path):
+    return count_index.load_season_counts(csv_path)
+
+# per-show count matrix of one season, from its count index; runs inside worker processes
+def count_matrix_file(csv_path):
+    return count_index.load_count_matrix(csv_path)
+
+def _map_files(fn, paths, workers):
+    paths = list(paths)
+    workers = min(workers or os.cpu_count() or 1, len(paths) or 1)
+    if workers == 1:
+        return [fn(path) for path in paths]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(fn, paths))
+
+# counts many seasons, one season per task, on `workers` processes
+# (all cores when None, in this process when 1). results keep the order of paths.
+def count_files_parallel(paths, workers=None):
+    return _map_files(count_file, paths, workers)
+
+# like count_files_parallel, but returns each season's CountMatrix
+# (which also knows its number of shows and review tokens)
+def count_matrices_parallel(paths, workers=None):
+    return _map_files(count_matrix_file, paths, workers)
+
+# cleans and counts a large list of raw reviews by sharding it into chunks
+# across `workers` processes and merging the per-chunk Counters
+def count_reviews_parallel(reviews, workers=None, chunk_size=500):
+    reviews = [str(review) for review in reviews]
+    chunks = [reviews[i:i + chunk_size] for i in range(0, len(reviews), chunk_size)]
+    workers = min(workers or os.cpu_count() or 1, len(chunks) or 1)
+
+    column_counts = Counter()
+    if workers == 1:
+        for chunk in chunks:
+            column_counts.update(count_review_chunk(chunk))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for chunk_counts in pool.map(count_review_chunk, chunks):
+                column_counts.update(chunk_counts)
+    return counts_from_columns(column_counts)
+
+# used to analyze a single season (counts come from the season's count index)
 def analyze_single_season(csv_path):
-    clean_review= get_clean_rev(csv_path)
-    keyword_counts = get_counts(clean_review)
+    keyword_counts = count_index.load_season_counts(csv_path)
     return keyword_counts
 
+# keyword counts of a season summed in the show catalog with SQL instead of
+# re-reading its reviews; the season must have been scraped (or synced) into the catalog
+def analyze_season_catalog(season_string):
+    return catalog.get_catalog().season_counts(season_string)
+
 # used to analyze and compare two seasons
+# (both seasons load at once; reading the index and parquet files mostly runs outside the GIL)
 def compare_seasons(csv_path_1, csv_path_2):
-    clean_review_1 = get_clean_rev(csv_path_1)
-    keyword_counts_1 = get_counts(clean_review_1)
-
-    clean_review_2 = get_clean_rev(csv_path_2)
-    keyword_counts_2 = get_counts(clean_review_2)
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        keyword_counts_1, keyword_counts_2 = pool.map(count_index.load_season_counts, [csv_path_1, csv_path_2])
 
     return keyword_counts_1, keyword_counts_2
-
@@ -0,0 +1,680 @@
+import os, sys, glob, time, shutil, tempfile, threading
+from contextlib import contextmanager
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+# fixture show page with the markup scrape_show_page looks for
+SHOW_PAGE = """<html><body>
+<div class="article__body">
+  Soft tailoring in dusty pink and chocolate brown, with sheer organza layered
+  over wide-leg pants and a faux fur trench coat. Florals, stripes and plaid.
+</div>
+</body></html>"""
+
+
+# local stand-in for vogue.com that serves fixture pages with artificial latency
+class FixtureHandler(BaseHTTPRequestHandler):
+    latency = 0.3
+    body = SHOW_PAGE.encode()
+    content_type = "text/html"
+
+    def do_GET(self):
+        time.sleep(self.latency)
+        body = self.body
+        self.send_response(200)
+        self.send_header("Content-Type", self.content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+# starts the fixture server on a free port in a background thread
+def start_fixture_server(latency=0.3, body=None, content_type="text/html"):
+    handler = type("Handler", (FixtureHandler,), {"latency": latency, "body": body or SHOW_PAGE.encode(),
+                                                  "content_type": content_type})
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+# compares sequential and concurrent scraping of n fixture shows
+def bench_scrape(n_shows=40, latency=0.3, workers=8, rate=20.0):
+    from scraper import scrape_all_shows, RateLimiter
+    import transport, http_cache
+
+    http_cache.set_cache(http_cache.ResponseCache(tempfile.mkdtemp()))
+    server = start_fixture_server(latency)
+    host, port = server.server_address
+    show_links = [{"designer": f"Designer {i}",
+                   "url": f"http://{host}:{port}/fashion-shows/spring-2025-ready-to-wear/designer-{i}"}
+                  for i in range(n_shows)]
+
+    # the last run is served from the cache the previous run filled
+    for n_workers, cold in ((1, True), (workers, True), (workers, False)):
+        if cold:
+            http_cache.get_cache().clear()
+        limiter = RateLimiter(rate=rate, max_in_flight=n_workers)
+        start = time.perf_counter()
+        shows = scrape_all_shows(show_links, workers=n_workers, limiter=limiter)
+        elapsed = time.perf_counter() - start
+        in_order = [s["collection_url"] for s in shows] == [s["url"] for s in show_links]
+        metrics = transport.recent_metrics()[-n_shows:]
+        label = f"workers={n_workers}" + ("" if cold else " (cached)")
+        print(f"{label}: {len(shows)} shows in {elapsed:.2f}s "
+              f"({len(shows) / elapsed:.1f} shows/s, ordered={in_order}, "
+              f"{sum(m.bytes for m in metrics)} bytes, "
+              f"mean latency {sum(m.latency for m in metrics) / len(metrics):.3f}s, "
+              f"{sum(m.retries for m in metrics)} retries)")
+
+    server.shutdown()
+
+
+# serves n fixture shows per season as the collection of any season the pipeline asks for:
+# show links point at the fixture server, the host gets its own rate limit, and the stores,
+# catalog and response cache live in a throwaway directory that is removed afterwards
+@contextmanager
+def fixture_site(n_shows, latency, workers, rate):
+    import scraper, http_cache, catalog
+
+    http_cache.set_cache(http_cache.ResponseCache(tempfile.mkdtemp()))
+    server = start_fixture_server(latency)
+    host, port = server.server_address
+    origin = f"http://{host}:{port}"
+    scraper.HOST_LIMITS[f"{host}:{port}"] = (rate, workers * 2)
+
+    def fixture_links(collection_url):
+        season = collection_url.rstrip("/").rsplit("/", 1)[-1]
+        return [{"designer": f"Designer {i}", "url": f"{origin}/fashion-shows/{season}/designer-{i}"}
+                for i in range(n_shows)]
+
+    original_links, cwd, directory = scraper.get_show_links, os.getcwd(), tempfile.mkdtemp()
+    scraper.get_show_links = fixture_links
+    os.chdir(directory)
+    catalog._catalog = None
+    try:
+        yield
+    finally:
+        scraper.get_show_links = original_links
+        del scraper.HOST_LIMITS[f"{host}:{port}"]
+        os.chdir(cwd)
+        catalog._catalog = None
+        server.shutdown()
+        shutil.rmtree(directory)
+
+
+# comparing two seasons: one pipeline after the other vs both at once under one shared host limiter
+def bench_compare(n_shows=24, latency=0.3, workers=4, rate=20.0):
+    import pipeline
+
+    with fixture_site(n_shows, latency, workers, rate):
+        for run, seasons in enumerate((["spring-2025-ready-to-wear", "spring-2024-ready-to-wear"],
+                                       ["fall-2025-ready-to-wear", "fall-2024-ready-to-wear"])):
+            start = time.perf_counter()
+            if run == 0:
+                for season in seasons:
+                    pipeline.run_season_pipeline(season, workers=workers)
+            else:
+                pipeline.run_seasons_pipeline(seasons, workers=workers)
+            elapsed = time.perf_counter() - start
+            print(f"{'one after the other' if run == 0 else 'concurrently'}: 2 x {n_shows} shows in {elapsed:.2f}s")
+
+
+# runs a season pipeline as a job against the fixture server, like the GUI does:
+# a repeated request joins the running job, and cancelling stops it within a show or so
+def bench_jobs(n_shows=60, latency=0.2, workers=4, rate=20.0, cancel_after=10):
+    import pipeline
+    from jobs import JobManager
+
+    def run(job, season):
+        return pipeline.run_season_pipeline(
+            season, lambda done, total, designer, cover: job.update('status', done, total),
+            workers=workers, cancel=job.cancel_event)
+
+    manager = JobManager()
+    messages = []
+    with fixture_site(n_shows, latency, workers, rate):
+        try:
+            season = "spring-2025-ready-to-wear"
+            job = manager.submit(('analyze', season), run, season, listener=lambda *m: messages.append(m))
+            again = manager.submit(('analyze', season), run, season)
+            print(f"repeated request joined the running job: {again is job}")
+
+            while not any(m[0] == 'status' and m[1] >= cancel_after for m in messages):
+                manager.poll()
+                time.sleep(0.05)
+            start = time.perf_counter()
+            job.cancel()
+            while not messages or messages[-1][0] != 'cancelled':
+                manager.poll()
+                time.sleep(0.01)
+            done = max(m[1] for m in messages if m[0] == 'status')
+            print(f"cancelled after {done}/{n_shows} shows, stopped in {(time.perf_counter() - start) * 1000:.0f}ms, "
+                  f"{len(messages)} messages delivered")
+        finally:
+            manager.shutdown()
+
+
+# synthetic collection page: server-rendered cards plus an embedded json state
+def make_collection_page(n_shows=150, season="spring-2025-ready-to-wear"):
+    cards = "".join(
+        f'<div class="SummaryItem"><a class="SummaryItemHedLink" href="/fashion-shows/{season}/designer-{i}">'
+        f'<img src="https://assets.vogue.com/photos/{i}.jpg"><h3 data-testid="SummaryItemHed">Designer {i}</h3></a></div>'
+        for i in range(n_shows))
+    state = ",".join(f'{{"url":"\\u002Ffashion-shows\\u002F{season}\\u002Fdesigner-{i}"}}'
+                     for i in range(n_shows, n_shows + 20))
+    return (f"<html><head><script>window.__PRELOADED_STATE__ = {{\"items\":[{state}]}}</script></head>"
+            f"<body><nav>{cards}</nav></body></html>")
+
+
+# show links the browser path finds on a saved collection page, served locally under
+# the collection's path; None when no browser can be started here
+def selenium_show_links(html, season):
+    import browser_pool
+    from scraper import get_show_links_selenium
+
+    try:
+        with browser_pool.get_pool().driver():
+            pass
+    except Exception as e:
+        print(f"  browser comparison skipped: {type(e).__name__}: {e}")
+        return None
+    server = start_fixture_server(0, html)
+    host, port = server.server_address
+    try:
+        return get_show_links_selenium(f"http://{host}:{port}/fashion-shows/{season}")
+    finally:
+        server.shutdown()
+
+
+# times the static link extractor on saved collection pages (fixtures/collections/<season>.html),
+# falling back to a synthetic page when none are saved. a saved page's shows (designer and url)
+# are checked against the ones listed next to it (<season>.links.json) and, where a browser can be
+# started, against the shows the selenium path finds on the same page
+def bench_discovery(repeats=20):
+    import json
+    from scraper import parse_show_links
+
+    pages = {path: open(path, "rb").read() for path in sorted(glob.glob("fixtures/collections/*.html"))}
+    if not pages:
+        pages = {"synthetic/spring-2025-ready-to-wear.html": make_collection_page().encode()}
+
+    for path, html in pages.items():
+        season = path.rsplit("/", 1)[-1][:-len(".html")]
+        collection_url = f"https://www.vogue.com/fashion-shows/{season}"
+        start = time.perf_counter()
+        for _ in range(repeats):
+            shows = parse_show_links(html, collection_url)
+        elapsed = (time.perf_counter() - start) / repeats
+        print(f"{path}: {len(shows)} shows in {elapsed * 1000:.1f} ms ({len(html) / 1024:.0f} KiB page)")
+
+        if not os.path.exists(path):
+            continue
+        found = sorted((show["url"], show["designer"]) for show in shows)
+        links_path = path[:-len(".html")] + ".links.json"
+        if os.path.exists(links_path):
+            with open(links_path, encoding="utf-8") as f:
+                expected = sorted((show["url"], show["designer"]) for show in json.load(f))
+            assert found == expected, f"{path}: static shows differ from {links_path}"
+        browser = selenium_show_links(html, season)
+        if browser is not None:
+            assert found == sorted((show["url"], show["designer"]) for show in browser), \
+                f"{path}: static shows differ from the browser's"
+            print(f"  browser path found the same {len(browser)} shows")
+
+
+# the original get_counts: one list comprehension per category over whitespace tokens
+def legacy_get_counts(review):
+    from collections import Counter
+    from analyze import KEYWORDS
+
+    review_lst = review.split()
+    return {name: Counter([word for word in review_lst if word in category])
+            for name, category in KEYWORDS.items()}
+
+
+# review text from the scraped seasons in data/, or synthetic text when there are none
+def load_review_text(min_chars=2_000_000):
+    import random
+    from analyze import get_clean_rev, KEYWORDS
+    from store import list_seasons
+
+    # real reviews are repeated up to min_chars so timings are stable
+    text = " ".join(get_clean_rev(path) for path in list_seasons())
+    if text:
+        return " ".join([text] * (min_chars // len(text) + 1))
+
+    rng = random.Random(0)
+    vocab = sorted(word for words in KEYWORDS.values() for word in words if word)
+    filler = "the collection was shown in paris with models walking slowly under a glass roof".split()
+    words, size = [], 0
+    while size < min_chars:
+        word = rng.choice(vocab) if rng.random() < 0.08 else rng.choice(filler)
+        words.append(word)
+        size += len(word) + 1
+    return " ".join(words)
+
+
+# review-text throughput of the trie matcher against the original get_counts
+def bench_matcher(repeats=3):
+    from analyze import get_counts
+
+    text = load_review_text()
+    megabytes = len(text.encode()) / 1e6
+    for name, fn in (("legacy", legacy_get_counts), ("trie", get_counts)):
+        best = min(_timed(fn, text) for _ in range(repeats))
+        counts = fn(text)
+        print(f"{name}: {megabytes / best:.1f} MB/s over {megabytes:.1f} MB, "
+              f"{sum(sum(c.values()) for c in counts.values())} keyword hits")
+
+
+# writes a synthetic back catalog of season csvs with raw (uncleaned) reviews
+def make_corpus(directory, n_seasons=24, shows_per_season=150, words_per_review=600):
+    import csv, random
+    from analyze import KEYWORDS
+
+    rng = random.Random(0)
+    vocab = sorted(word for words in KEYWORDS.values() for word in words if word)
+    filler = "The collection, shown in Paris, had 42 models walking slowly under a glass roof.".split()
+    paths = []
+    for season in range(n_seasons):
+        path = f"{directory}/season_{season:03d}_shows.csv"
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["Designer", "Collection Name", "URL", "Cover Image", "Review"])
+            for show in range(shows_per_season):
+                review = " ".join(rng.choice(vocab) if rng.random() < 0.08 else rng.choice(filler)
+                                  for _ in range(words_per_review))
+                writer.writerow([f"Designer {show}", "", f"https://example.com/{season}/{show}", "", review])
+        paths.append(path)
+    return paths
+
+
+# scaling of process-pool counting over a synthetic multi-season corpus
+def bench_parallel(n_seasons=24):
+    import store, count_index
+    from analyze import count_files_parallel, count_reviews_parallel
+
+    directory = tempfile.mkdtemp()
+    paths = make_corpus(directory, n_seasons)
+    reviews = [review for path in paths for review in store.read_shows(path, columns=["Review"])["Review"]]
+    worker_counts = sorted({1, 2, 4, os.cpu_count() or 1})
+
+    # files: clean and count one season per task (the count index sidecars are
+    # removed before every run, otherwise only cached counts would be read)
+    base = None
+    for workers in worker_counts:
+        for path in paths:
+            if os.path.exists(count_index.index_path(path)):
+                os.remove(count_index.index_path(path))
+        elapsed = _timed(count_files_parallel, paths, workers)
+        base = base or elapsed
+        print(f"files, workers={workers}: {elapsed:.2f}s (speedup {base / elapsed:.1f}x)")
+
+    # reviews: clean and count chunks of one big review list
+    base = None
+    for workers in worker_counts:
+        elapsed = _timed(count_reviews_parallel, reviews, workers)
+        base = base or elapsed
+        print(f"reviews, workers={workers}: {elapsed:.2f}s (speedup {base / elapsed:.1f}x, {len(reviews)} reviews)")
+
+    shutil.rmtree(directory)
+
+
+def _disk_size(path):
+    if os.path.isfile(path):
+        return os.path.getsize(path)
+    return sum(os.path.getsize(os.path.join(root, name)) for root, _, names in os.walk(path) for name in names)
+
+
+# load time and disk footprint of csv seasons against their migrated parquet stores
+def bench_store(n_seasons=12, repeats=3):
+    import pandas as pd
+    from store import migrate_csv, read_shows
+
+    directory = tempfile.mkdtemp()
+    csv_paths = make_corpus(directory, n_seasons)
+    stores = [migrate_csv(path) for path in csv_paths]
+
+    for label, paths, load in (
+            ("csv, full read", csv_paths, lambda p: pd.read_csv(p)),
+            ("parquet, full read", stores, lambda p: read_shows(p)),
+            ("parquet, Cleaned Review only", stores, lambda p: read_shows(p, columns=["Cleaned Review"]))):
+        best = min(_timed(lambda: [load(p) for p in paths]) for _ in range(repeats))
+        size = sum(_disk_size(p) for p in paths)
+        print(f"{label}: {best * 1000:.0f} ms for {len(paths)} seasons, {size / 1e6:.1f} MB on disk")
+
+    shutil.rmtree(directory)
+
+
+# multi-season counting from review text against the precomputed count indexes
+def bench_index(n_seasons=24, repeats=3):
+    from analyze import get_counts, get_clean_rev
+    from count_index import load_season_counts
+    from store import migrate_csv
+
+    directory = tempfile.mkdtemp()
+    stores = [migrate_csv(path, remove=True) for path in make_corpus(directory, n_seasons)]
+
+    recount = min(_timed(lambda: [get_counts(get_clean_rev(p)) for p in stores]) for _ in range(repeats))
+    build = _timed(lambda: [load_season_counts(p) for p in stores])
+    cached = min(_timed(lambda: [load_season_counts(p) for p in stores]) for _ in range(repeats))
+    print(f"recount from text: {recount * 1000:.0f} ms, first index build: {build * 1000:.0f} ms, "
+          f"from index: {cached * 1000:.0f} ms ({n_seasons} seasons)")
+
+    shutil.rmtree(directory)
+
+
+# ad-hoc keyword queries: full-text search and SQL aggregation in the catalog vs scanning the season files
+def bench_catalog(n_seasons=12, repeats=3):
+    from analyze import get_counts, get_clean_rev, clean_text
+    from catalog import Catalog, phrase
+    from store import iter_shows
+
+    directory = tempfile.mkdtemp()
+    paths = make_corpus(directory, n_seasons)
+    slugs = [os.path.basename(p)[:-len("_shows.csv")] for p in paths]
+    catalog = Catalog(os.path.join(directory, "catalog.sqlite3"))
+    load = _timed(lambda: [catalog.sync_season(slug, p) for slug, p in zip(slugs, paths)])
+
+    def scan_designers(word):
+        return sorted({show["designer"] for p in paths for show in iter_shows(p)
+                       if f" {word} " in f" {clean_text(show['review'])} "})
+
+    assert scan_designers("chartreuse") == catalog.designers_mentioning("chartreuse")
+    scan = min(_timed(scan_designers, "chartreuse") for _ in range(repeats))
+    fts = min(_timed(catalog.search, phrase("chartreuse"), None, None, -1) for _ in range(repeats))
+    print(f"designers mentioning a word: scan {scan * 1000:.0f} ms, fts {fts * 1000:.1f} ms "
+          f"(catalog load {load:.1f}s, {n_seasons} seasons)")
+
+    recount = min(_timed(lambda: [get_counts(get_clean_rev(p)) for p in paths]) for _ in range(repeats))
+    sql = min(_timed(lambda: [catalog.season_counts(slug) for slug in slugs]) for _ in range(repeats))
+    print(f"category counts: recount {recount * 1000:.0f} ms, sql {sql * 1000:.0f} ms")
+
+    catalog.close()
+    shutil.rmtree(directory)
+
+
+# trend classification over a large terms x seasons matrix: one polyfit per term vs all terms at once
+def bench_trends(n_terms=5000, n_seasons=50):
+    import numpy as np
+    from trend_prediction import classify_trends, trend_slopes
+    from trend_stats import score_trends
+
+    rng = np.random.default_rng(0)
+    values = rng.poisson(rng.uniform(0, 20, (n_terms, 1)), (n_terms, n_seasons))
+
+    def per_item():
+        return np.array([np.polyfit(range(n_seasons), row, 1)[0] for row in values])
+
+    assert np.allclose(per_item(), trend_slopes(values))
+    loop = _timed(per_item)
+    batched = min(_timed(classify_trends, values) for _ in range(3))
+    print(f"polyfit per term: {loop * 1000:.0f} ms, batched: {batched * 1000:.1f} ms "
+          f"({n_terms} terms x {n_seasons} seasons)")
+
+    shows = rng.integers(80, 120, n_seasons).astype(float)
+    for method in ("ols", "mann-kendall"):
+        elapsed = min(_timed(score_trends, values, shows, None, "show", method) for _ in range(3))
+        print(f"{method} significance over every term: {elapsed * 1000:.0f} ms")
+
+
+# forecasting the whole vocabulary in one pass, and a rolling backtest against the naive baselines
+def bench_forecast(n_terms=2000, n_seasons=50):
+    import numpy as np
+    from forecast import forecast, backtest
+
+    rng = np.random.default_rng(0)
+    t = np.arange(n_seasons)
+    drift = rng.uniform(-0.02, 0.02, (n_terms, 1)) * t
+    cycle = rng.uniform(0, 0.5, (n_terms, 1)) * np.where(t % 2 == 0, 1, -1)
+    rates = np.maximum(1 + drift + cycle + rng.normal(0, 0.2, (n_terms, n_seasons)), 0)
+
+    for method in ("holt", "seasonal"):
+        elapsed = min(_timed(forecast, rates, 2, method) for _ in range(3))
+        print(f"{method} forecast of {n_terms} terms x {n_seasons} seasons: {elapsed * 1000:.0f} ms")
+    print(backtest(rates, horizon=1, min_train=n_seasons - 12).round(4))
+
+
+# time the Tk thread spends per cover: blocking fetch+decode+resize (the old update_status)
+# vs handing it to the thumbnail pool, and how long until every cover is ready
+def bench_covers(n_covers=24, latency=0.15):
+    from io import BytesIO
+    from PIL import Image
+    import transport, http_cache
+    from thumbnails import ThumbnailLoader, THUMB_SIZE
+
+    image = BytesIO()
+    Image.new("RGB", (1200, 1800), (230, 200, 200)).save(image, "JPEG")
+    server = start_fixture_server(latency, image.getvalue(), "image/jpeg")
+    base = f"http://127.0.0.1:{server.server_port}"
+    directory = tempfile.mkdtemp()
+    http_cache.set_cache(http_cache.ResponseCache(os.path.join(directory, "http")))
+
+    def blocking(run):
+        for i in range(n_covers):
+            response = transport.get(f"{base}/{run}/{i}.jpg", cache=False)
+            Image.open(BytesIO(response.content)).resize(THUMB_SIZE)
+
+    def pooled(loader, run):
+        ready = threading.Semaphore(0)
+        start = time.perf_counter()
+        for i in range(n_covers):
+            loader.load(f"{base}/{run}/{i}.jpg", lambda url, image: ready.release())
+        handed_off = time.perf_counter() - start
+        for _ in range(n_covers):
+            ready.acquire()
+        return handed_off, time.perf_counter() - start
+
+    old = _timed(blocking, "old")
+    thumbs = os.path.join(directory, "thumbs")
+    handed_off, total = pooled(ThumbnailLoader(directory=thumbs, window=n_covers), "new")
+    _, warm = pooled(ThumbnailLoader(directory=thumbs, window=n_covers), "new")
+    print(f"Tk thread blocked: {old * 1000:.0f} ms inline vs {handed_off * 1000:.1f} ms with the pool; "
+          f"all covers ready after {total * 1000:.0f} ms, {warm * 1000:.0f} ms from the disk cache "
+          f"({n_covers} covers)")
+
+    server.shutdown()
+    http_cache.set_cache(None)
+    shutil.rmtree(directory)
+
+
+# import budget of the start window, in ms; the heavy modules load after it paints
+STARTUP_BUDGET_MS = 300
+
+# parses `python -X importtime` output into {module: (self us, cumulative us)}
+def _import_times(module):
+    import subprocess
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                            capture_output=True, text=True, cwd=os.path.dirname(os.path.abspath(__file__)))
+    times = {}
+    for line in result.stderr.splitlines():
+        if line.startswith("import time:") and "|" in line and "self [us]" not in line:
+            own, cumulative, name = line[len("import time:"):].split("|")
+            times[name.strip()] = (int(own), int(cumulative))
+    return times
+
+# startup cost of the entry points, as `python -X importtime` sees it, and the time
+# until the GUI's start page has painted (when a display is available)
+def bench_startup():
+    import subprocess
+    for module in ("gui", "cli", "scraper", "pipeline", "analyze"):
+        times = _import_times(module)
+        total = times.get(module, (0, 0))[1] / 1000
+        heaviest = sorted(((c, n) for n, (_, c) in times.items() if "." not in n and n != module), reverse=True)[:4]
+        print(f"import {module}: {total:.0f} ms (" + ", ".join(f"{n} {c / 1000:.0f}" for c, n in heaviest) + ")")
+
+    gui_ms = _import_times("gui").get("gui", (0, 0))[1] / 1000
+    print(f"gui import {'within' if gui_ms <= STARTUP_BUDGET_MS else 'OVER'} its {STARTUP_BUDGET_MS} ms budget")
+
+    if os.environ.get("DISPLAY"):
+        script = ("import time; start = time.perf_counter(); import gui; app = gui.FashionTrendAnalyzer(); "
+                  "app.update(); print(f'{(time.perf_counter() - start) * 1000:.0f}'); app.destroy()")
+        result = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__)))
+        print(f"start page painted after {result.stdout.strip()} ms")
+
+
+# memory a long GUI session may gain over 100 consecutive analyses once warmed up
+FIGURE_MEMORY_BUDGET_MB = 2.0
+
+# 100 consecutive analyses drawn the way the results page draws them: a few live redraws,
+# then the final counts, all on one reused figure, which must stay within FIGURE_MEMORY_BUDGET_MB.
+# for contrast, a few analyses are drawn on a new pyplot figure each, as the page used to.
+def bench_figures(analyses=100, partials=10, old_analyses=1):
+    import gc, logging, random, tracemalloc
+    from collections import Counter
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    import plot
+    from analyze import KEYWORDS
+
+    logging.getLogger("matplotlib.font_manager").setLevel(logging.ERROR)
+    rng = random.Random(0)
+    terms = {category: sorted(words)[:30] for category, words in KEYWORDS.items()}
+    # a few terms dominate each category, as in real reviews
+    weights = [1 / (rank + 1) for rank in range(30)]
+
+    # (season, [running counts after each batch of shows]) of one analysis
+    def analysis(n):
+        counts = {category: Counter() for category in terms}
+        snapshots = []
+        for _ in range(partials + 1):
+            for category, words in terms.items():
+                counts[category].update(rng.choices(words, weights[:len(words)], k=50))
+            snapshots.append({category: Counter(c) for category, c in counts.items()})
+        return f"season-{n % 7}", snapshots
+
+    def new_figures(season, snapshots):
+        for snapshot in snapshots:
+            fig = plt.figure(figsize=(12, 8))
+            plot.plot_single_season(snapshot, season, fig)
+            fig.canvas.draw()
+
+    keyword_plot = plot.KeywordPlot(animated=True)
+    FigureCanvasAgg(keyword_plot.fig)
+    redraws = Counter()
+
+    def reused_figure(season, snapshots):
+        for i, snapshot in enumerate(snapshots):
+            full = keyword_plot.update(snapshot, season, live=i < len(snapshots) - 1)
+            keyword_plot.draw(full)
+            redraws["full" if full else "blitted"] += 1
+
+    # resident memory in MB (linux); elsewhere python allocations traced by tracemalloc,
+    # which is exact but slows drawing down a lot
+    def memory():
+        gc.collect()
+        if os.path.exists("/proc/self/statm"):
+            with open("/proc/self/statm") as f:
+                return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+        return tracemalloc.get_traced_memory()[0] / 2**20
+
+    # warms up, then returns (seconds, MB gained) over the given analyses
+    def measure(draw, runs):
+        for season, snapshots in runs[:2]:
+            draw(season, snapshots)
+        before = memory()
+        start = time.perf_counter()
+        for season, snapshots in runs:
+            draw(season, snapshots)
+        elapsed = time.perf_counter() - start
+        return elapsed, memory() - before
+
+    for name, draw, count in (("new pyplot figure per draw", new_figures, old_analyses),
+                              ("one reused figure", reused_figure, analyses)):
+        elapsed, grown = measure(draw, [analysis(n) for n in range(count)])
+        print(f"{name}: {elapsed / count * 1000:.0f} ms per analysis, +{grown:.1f} MB over {count} analyses "
+              f"({grown / count:.2f} MB each), {len(plt.get_fignums())} pyplot figures open")
+        plt.close("all")
+    print(f"reused figure: {redraws['full']} full redraws, {redraws['blitted']} blitted")
+
+    assert grown <= FIGURE_MEMORY_BUDGET_MB, f"reused figure grew {grown:.1f} MB over {analyses} analyses"
+    assert not plt.get_fignums()
+
+
+def _timed(fn, *args):
+    start = time.perf_counter()
+    fn(*args)
+    return time.perf_counter() - start
+
+
+# fast check of the results page's partial redraws on an Agg canvas: live updates that only grow
+# the bars are blitted without a full draw and match a full draw pixel for pixel, labels that
+# outgrow their panel take draw()'s relayout path (one full draw), and no pyplot figure is opened
+def bench_blit(updates=50):
+    import logging
+    from collections import Counter
+    import numpy as np
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    import plot
+    from analyze import KEYWORDS
+
+    logging.getLogger("matplotlib.font_manager").setLevel(logging.ERROR)
+    figures_open = len(plt.get_fignums())
+    keyword_plot = plot.KeywordPlot(animated=True)
+    canvas = FigureCanvasAgg(keyword_plot.fig)
+    full_draws = []
+    canvas.mpl_connect("draw_event", lambda event: full_draws.append(event))
+
+    counts = {category: Counter({word: 10 - i for i, word in enumerate(sorted(words)[:10])})
+              for category, words in KEYWORDS.items()}
+    keyword_plot.draw(keyword_plot.update(counts, "spring-2025-ready-to-wear", live=True))
+    assert len(full_draws) == 1
+
+    # same terms, growing counts: every redraw is blitted
+    start = time.perf_counter()
+    for _ in range(updates):
+        for terms in counts.values():
+            terms.update(list(terms)[:3])
+        assert not keyword_plot.update(counts, "spring-2025-ready-to-wear", live=True)
+        keyword_plot.draw(full=False)
+    elapsed = time.perf_counter() - start
+    assert len(full_draws) == 1, f"{len(full_draws) - 1} full draws while only bars grew"
+    blitted = np.array(canvas.buffer_rgba())
+    canvas.draw()
+    assert (blitted == np.array(canvas.buffer_rgba())).all(), "blitted frame differs from a full draw"
+    print(f"{updates} blitted redraws: {elapsed / updates * 1000:.1f} ms each")
+
+    # a term far longer than the labels the layout made room for
+    counts["colors"]["an extraordinarily long color name that needs far more room"] = 1000
+    assert not keyword_plot.update(counts, "spring-2025-ready-to-wear", live=True)
+    before = len(full_draws)
+    keyword_plot.draw(full=False)
+    assert len(full_draws) == before + 1, "labels outgrew their panel without a relayout"
+    print("long label: laid out again with one full draw")
+
+    assert len(plt.get_fignums()) == figures_open, "KeywordPlot left pyplot figures open"
+
+
+BENCHMARKS = {
+    "scrape": bench_scrape,
+    "compare": bench_compare,
+    "jobs": bench_jobs,
+    "discovery": bench_discovery,
+    "matcher": bench_matcher,
+    "parallel": bench_parallel,
+    "store": bench_store,
+    "index": bench_index,
+    "catalog": bench_catalog,
+    "trends": bench_trends,
+    "forecast": bench_forecast,
+    "startup": bench_startup,
+    "covers": bench_covers,
+    "figures": bench_figures,
+    "blit": bench_blit,
+}
+
+if __name__ == "__main__":
+    names = sys.argv[1:] or list(BENCHMARKS)
+    for name in names:
+        print(f"== {name} ==")
+        BENCHMARKS[name]()
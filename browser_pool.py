@@ -0,0 +1,119 @@
+import os, atexit, threading
+from contextlib import contextmanager
+from selenium import webdriver
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.chrome.service import Service
+from webdriver_manager.chrome import ChromeDriverManager
+
+# remembers the resolved chromedriver binary between runs
+DRIVER_PATH_FILE = os.path.join('data', 'cache', 'chromedriver_path.txt')
+
+# drivers are restarted after this many pages to keep chrome's memory in check
+DEFAULT_MAX_PAGES = 20
+
+_driver_path = None
+_driver_path_lock = threading.Lock()
+
+
+# resolves chromedriver once: from memory, then the path file, then webdriver_manager.
+# stale: a path that failed to start chrome (e.g. after a chrome update); it is forgotten
+# and resolved again, unless another thread already did
+def driver_path(stale=None):
+    global _driver_path
+    with _driver_path_lock:
+        if stale is not None and _driver_path in (None, stale):
+            _driver_path = None
+            try:
+                os.remove(DRIVER_PATH_FILE)
+            except OSError:
+                pass
+        if _driver_path is None:
+            try:
+                with open(DRIVER_PATH_FILE) as f:
+                    path = f.read().strip()
+            except OSError:
+                path = ''
+            if not os.path.exists(path):
+                path = ChromeDriverManager().install()
+                os.makedirs(os.path.dirname(DRIVER_PATH_FILE), exist_ok=True)
+                with open(DRIVER_PATH_FILE, 'w') as f:
+                    f.write(path)
+            _driver_path = path
+        return _driver_path
+
+
+# starts a headless driver; if the remembered chromedriver no longer works
+# (e.g. SessionNotCreatedException after a chrome update) it is resolved again once
+def make_driver():
+    options = webdriver.ChromeOptions()
+    options.add_argument("--headless=new")
+    options.add_argument("--disable-gpu")
+    options.add_argument("--no-sandbox")
+    options.add_argument("--window-size=1920,1080")
+    path = driver_path()
+    try:
+        return webdriver.Chrome(service=Service(path), options=options)
+    except WebDriverException:
+        return webdriver.Chrome(service=Service(driver_path(stale=path)), options=options)
+
+
+# lazily started headless drivers that are reused across seasons and GUI runs.
+# a driver is recycled after max_pages pages or when it raises a WebDriverException.
+class BrowserPool:
+    def __init__(self, size=1, max_pages=DEFAULT_MAX_PAGES):
+        self.max_pages = max_pages
+        self.slots = threading.BoundedSemaphore(size)
+        self.lock = threading.Lock()
+        self.idle = []
+
+    # borrows a driver for one page load
+    @contextmanager
+    def driver(self):
+        self.slots.acquire()
+        try:
+            with self.lock:
+                entry = self.idle.pop() if self.idle else None
+            if entry is None:
+                entry = [make_driver(), 0]
+
+            crashed = False
+            try:
+                yield entry[0]
+            except WebDriverException:
+                crashed = True
+                raise
+            finally:
+                entry[1] += 1
+                if not crashed and entry[1] < self.max_pages:
+                    with self.lock:
+                        self.idle.append(entry)
+                else:
+                    self._quit(entry[0])
+        finally:
+            self.slots.release()
+
+    def _quit(self, driver):
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+    # quits every idle driver
+    def close(self):
+        with self.lock:
+            idle, self.idle = self.idle, []
+        for driver, _ in idle:
+            self._quit(driver)
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+# returns the process-wide pool, started on first use and closed at exit
+def get_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = BrowserPool()
+            atexit.register(_pool.close)
+        return _pool
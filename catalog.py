@@ -0,0 +1,224 @@
+import os, sqlite3, threading
+from collections import Counter
+import analyze, store, seasons
+
+CATALOG_PATH = os.path.join('data', 'catalog.sqlite3')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS designers (id INTEGER PRIMARY KEY, name TEXT UNIQUE NOT NULL);
+CREATE TABLE IF NOT EXISTS seasons (id INTEGER PRIMARY KEY, slug TEXT UNIQUE NOT NULL, path TEXT);
+CREATE TABLE IF NOT EXISTS shows (
+    id INTEGER PRIMARY KEY,
+    season_id INTEGER NOT NULL REFERENCES seasons(id),
+    designer_id INTEGER NOT NULL REFERENCES designers(id),
+    collection_name TEXT,
+    url TEXT UNIQUE NOT NULL,
+    cover_image TEXT,
+    review TEXT,
+    cleaned_review TEXT
+);
+CREATE INDEX IF NOT EXISTS shows_season ON shows(season_id);
+CREATE INDEX IF NOT EXISTS shows_designer ON shows(designer_id);
+
+-- keyword counts per show, so category totals are a GROUP BY away
+CREATE TABLE IF NOT EXISTS show_terms (
+    show_id INTEGER NOT NULL REFERENCES shows(id) ON DELETE CASCADE,
+    term TEXT NOT NULL,
+    category TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (show_id, category, term)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS show_terms_category ON show_terms(category, term);
+
+-- full-text index over cleaned reviews; hyphenated words such as wide-leg stay one token
+CREATE VIRTUAL TABLE IF NOT EXISTS shows_fts USING fts5(
+    cleaned_review, content='shows', content_rowid='id', tokenize="unicode61 tokenchars '-'"
+);
+CREATE TRIGGER IF NOT EXISTS shows_ai AFTER INSERT ON shows BEGIN
+    INSERT INTO shows_fts(rowid, cleaned_review) VALUES (new.id, new.cleaned_review);
+END;
+CREATE TRIGGER IF NOT EXISTS shows_ad AFTER DELETE ON shows BEGIN
+    INSERT INTO shows_fts(shows_fts, rowid, cleaned_review) VALUES ('delete', old.id, old.cleaned_review);
+END;
+CREATE TRIGGER IF NOT EXISTS shows_au AFTER UPDATE ON shows BEGIN
+    INSERT INTO shows_fts(shows_fts, rowid, cleaned_review) VALUES ('delete', old.id, old.cleaned_review);
+    INSERT INTO shows_fts(rowid, cleaned_review) VALUES (new.id, new.cleaned_review);
+END;
+"""
+
+
+# quotes text as one fts5 phrase, so words like wide-leg and multi-word phrases match literally
+def phrase(text):
+    return '"' + analyze.clean_text(text).replace('"', '""') + '"'
+
+
+# local catalog of every scraped show with designers, seasons, keyword counts and a full-text index.
+# safe to share between threads; every call holds the connection lock.
+class Catalog:
+    def __init__(self, path=CATALOG_PATH):
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self.path = path
+        self.lock = threading.Lock()
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.execute('PRAGMA journal_mode=WAL')
+        self.db.execute('PRAGMA foreign_keys=ON')
+        with self.db:
+            self.db.executescript(SCHEMA)
+        self._check_vocabulary()
+
+    def close(self):
+        with self.lock:
+            self.db.close()
+
+    # recounts show_terms when the keyword sets in analyze.py changed since they were counted
+    def _check_vocabulary(self):
+        row = self.db.execute("SELECT value FROM meta WHERE key = 'vocabulary_hash'").fetchone()
+        if row and row[0] == analyze.VOCABULARY_HASH:
+            return
+        with self.lock, self.db:
+            self.db.execute('DELETE FROM show_terms')
+            shows = self.db.execute('SELECT id, cleaned_review FROM shows').fetchall()
+            for show_id, cleaned in shows:
+                self._insert_terms(show_id, cleaned or '')
+            self.db.execute("INSERT OR REPLACE INTO meta VALUES ('vocabulary_hash', ?)", (analyze.VOCABULARY_HASH,))
+
+    def _id(self, table, column, value, extra=None):
+        row = self.db.execute(f'SELECT id FROM {table} WHERE {column} = ?', (value,)).fetchone()
+        if row:
+            return row[0]
+        columns, values = [column], [value]
+        if extra:
+            columns += list(extra)
+            values += list(extra.values())
+        cursor = self.db.execute(
+            f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' * len(values))})", values)
+        return cursor.lastrowid
+
+    def _insert_terms(self, show_id, cleaned):
+        column_counts = Counter(analyze.match_columns(cleaned.split()))
+        self.db.executemany(
+            'INSERT INTO show_terms VALUES (?, ?, ?, ?)',
+            [(show_id, analyze.VOCABULARY[column], name, num)
+             for column, num in column_counts.items() for name in analyze.TERM_CATEGORIES[column]])
+
+    def _add(self, season_string, show, season_path, replace):
+        url = show['collection_url']
+        existing = self.db.execute('SELECT id FROM shows WHERE url = ?', (url,)).fetchone()
+        if existing and not replace:
+            return existing[0]
+
+        cleaned = show.get('cleaned_review') or analyze.clean_text(show.get('review') or '')
+        season_id = self._id('seasons', 'slug', season_string, {'path': season_path})
+        designer_id = self._id('designers', 'name', show['designer'] or 'Unknown')
+        values = (season_id, designer_id, show.get('collection_name'), url,
+                  show.get('cover_image'), show.get('review'), cleaned)
+
+        if existing:
+            show_id = existing[0]
+            self.db.execute('DELETE FROM show_terms WHERE show_id = ?', (show_id,))
+            self.db.execute(
+                'UPDATE shows SET season_id = ?, designer_id = ?, collection_name = ?, url = ?, '
+                'cover_image = ?, review = ?, cleaned_review = ? WHERE id = ?', values + (show_id,))
+        else:
+            show_id = self.db.execute(
+                'INSERT INTO shows (season_id, designer_id, collection_name, url, cover_image, review, '
+                'cleaned_review) VALUES (?, ?, ?, ?, ?, ?, ?)', values).lastrowid
+        self._insert_terms(show_id, cleaned)
+        return show_id
+
+    # adds (or with replace=True updates) one scraped show of a season, committed right away
+    def add_show(self, season_string, show, season_path=None, replace=True):
+        with self.lock, self.db:
+            return self._add(season_string, show, season_path, replace)
+
+    # loads every show of a season store (or legacy csv) that the catalog does not have yet,
+    # in a single transaction
+    def sync_season(self, season_string, season_path):
+        with self.lock, self.db:
+            for show in store.iter_shows(season_path):
+                self._add(season_string, show, season_path, replace=False)
+
+    def _query(self, sql, params=()):
+        with self.lock:
+            return self.db.execute(sql, params).fetchall()
+
+    # shows whose review matches an fts5 query, best matches first.
+    # use phrase() for literal words and phrases, or pass fts5 syntax (AND/OR/NEAR) directly.
+    def search(self, query, season=None, designer=None, limit=50):
+        sql = ("SELECT d.name, s.slug, sh.url, snippet(shows_fts, 0, '[', ']', '...', 12) "
+               'FROM shows_fts JOIN shows sh ON sh.id = shows_fts.rowid '
+               'JOIN seasons s ON s.id = sh.season_id JOIN designers d ON d.id = sh.designer_id '
+               'WHERE shows_fts MATCH ?')
+        params = [query]
+        if season:
+            sql += ' AND s.slug = ?'
+            params.append(season)
+        if designer:
+            sql += ' AND d.name = ?'
+            params.append(designer)
+        sql += ' ORDER BY rank LIMIT ?'
+        params.append(limit)
+        return self._query(sql, params)
+
+    # designers whose reviews mention a word or phrase, e.g. designers_mentioning('chartreuse', 'fall-2024-ready-to-wear')
+    def designers_mentioning(self, text, season=None):
+        return sorted({row[0] for row in self.search(phrase(text), season, limit=-1)})
+
+    # mentions of a vocabulary term per designer, most first
+    def term_by_designer(self, term, season=None):
+        sql = ('SELECT d.name, SUM(t.count) FROM show_terms t JOIN shows sh ON sh.id = t.show_id '
+               'JOIN designers d ON d.id = sh.designer_id JOIN seasons s ON s.id = sh.season_id '
+               'WHERE t.term = ? AND t.category = (SELECT MIN(category) FROM show_terms WHERE term = ?)')
+        params = [term, term]
+        if season:
+            sql += ' AND s.slug = ?'
+            params.append(season)
+        sql += ' GROUP BY d.name ORDER BY 2 DESC'
+        return self._query(sql, params)
+
+    # category totals of a season computed with SQL aggregation
+    def category_counts(self, season, category):
+        rows = self._query(
+            'SELECT t.term, SUM(t.count) FROM show_terms t JOIN shows sh ON sh.id = t.show_id '
+            'JOIN seasons s ON s.id = sh.season_id WHERE s.slug = ? AND t.category = ? GROUP BY t.term',
+            (season, category))
+        return Counter(dict(rows))
+
+    # every category of a season, in the {category: Counter} layout of analyze.get_counts
+    def season_counts(self, season):
+        counts = {name: Counter() for name in analyze.KEYWORDS}
+        rows = self._query(
+            'SELECT t.category, t.term, SUM(t.count) FROM show_terms t JOIN shows sh ON sh.id = t.show_id '
+            'JOIN seasons s ON s.id = sh.season_id WHERE s.slug = ? GROUP BY t.category, t.term',
+            (season,))
+        for name, term, num in rows:
+            counts[name][term] = num
+        return counts
+
+    def seasons(self):
+        return [row[0] for row in self._query('SELECT slug FROM seasons ORDER BY slug')]
+
+
+_catalog = None
+_catalog_lock = threading.Lock()
+
+# returns the process-wide catalog, opened on first use
+def get_catalog():
+    global _catalog
+    with _catalog_lock:
+        if _catalog is None:
+            _catalog = Catalog()
+        return _catalog
+
+
+# one-shot load of every season store in a directory, e.g. after upgrading an existing data/ folder
+def sync_all(directory='data'):
+    shows = get_catalog()
+    for path in store.list_seasons(directory):
+        shows.sync_season(seasons.load_info(path)['slug'], path)
+        print(f"Catalogued {path}")
+
+
+if __name__ == "__main__":
+    sync_all()
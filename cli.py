@@ -0,0 +1,292 @@
+"""
+Headless command line interface for scheduled scrapes and analyses.
+
+    python cli.py scrape spring-2025-ready-to-wear fall-2025-ready-to-wear
+    python cli.py analyze spring-2025-ready-to-wear --json out.json --png out.png
+    python cli.py compare spring-2025-ready-to-wear spring-2024-ready-to-wear --csv out.csv
+    python cli.py trends --type ready-to-wear --years 2018-2025 --category colors --png trends.png
+    python cli.py forecast --category colors --csv forecast.csv
+    python cli.py export spring-2025-ready-to-wear --csv shows.csv
+
+Plots are rendered with the Agg backend, so no display is needed.
+"""
+import argparse, csv, json, os, sys
+import store, seasons
+from analyze import KEYWORDS
+
+
+# store path of a season given as a path or a slug such as spring-2025-ready-to-wear
+# (a legacy data/<season>_shows.csv is used when it has not been migrated)
+def season_location(season):
+    if os.path.exists(season):
+        return season
+    path = store.season_path(season)
+    legacy = store.legacy_path(path)
+    if not os.path.exists(path) and os.path.exists(legacy):
+        return legacy
+    return path
+
+
+def print_progress(done, total, designer, cover_image):
+    print(f"[{done}/{total}] {designer}", file=sys.stderr)
+
+
+# counts of a season, scraping it first when asked to (or when it was never scraped)
+def season_counts(season, args):
+    import pipeline, analyze
+
+    path = season_location(season)
+    if args.scrape or not os.path.exists(path):
+        if not args.scrape:
+            sys.exit(f"{season}: no stored data at {path} (use --scrape to fetch it)")
+        # the pipeline stores cleaned reviews and counts them as they arrive
+        return pipeline.run_season_pipeline(season, None if args.quiet else print_progress,
+                                            workers=args.workers, incremental=True)
+    return path, analyze.analyze_single_season(path)
+
+
+def counts_to_rows(counts, season):
+    return [{'season': season, 'category': category, 'term': term, 'count': num}
+            for category, terms in counts.items() for term, num in terms.most_common()]
+
+
+def write_json(path, data):
+    with open(path, 'w') as f:
+        json.dump(data, f, indent=2, default=str)
+    print(f"Wrote {path}", file=sys.stderr)
+
+
+def write_csv(path, rows):
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=list(rows[0]) if rows else ['season'])
+        writer.writeheader()
+        writer.writerows(rows)
+    print(f"Wrote {path}", file=sys.stderr)
+
+
+def write_png(path, fig):
+    import matplotlib.pyplot as plt
+
+    fig.savefig(path, dpi=120, bbox_inches='tight')
+    plt.close(fig)
+    print(f"Wrote {path}", file=sys.stderr)
+
+
+# out.png -> out_colors.png when one file is written per category
+def per_category(path, category, several):
+    if not several:
+        return path
+    stem, ext = os.path.splitext(path)
+    return f"{stem}_{category}{ext}"
+
+
+def print_top(counts, season, k=10):
+    print(season)
+    for category, terms in counts.items():
+        top = ', '.join(f"{term} ({num})" for term, num in terms.most_common(k))
+        print(f"  {category}: {top or '-'}")
+
+
+def cmd_scrape(args):
+    import pipeline
+
+    for season in args.seasons:
+        path, _ = pipeline.run_season_pipeline(season, None if args.quiet else print_progress,
+                                               workers=args.workers, incremental=not args.full)
+        print(path)
+
+
+def cmd_analyze(args):
+    from plot import plot_single_season
+
+    path, counts = season_counts(args.season, args)
+    if not args.quiet:
+        print_top(counts, args.season)
+    if args.json:
+        write_json(args.json, {'season': args.season, 'path': path, 'counts': counts})
+    if args.csv:
+        write_csv(args.csv, counts_to_rows(counts, args.season))
+    if args.png:
+        write_png(args.png, plot_single_season(counts, args.season))
+
+
+def cmd_compare(args):
+    from plot import plot_compared_seasons
+
+    _, counts_1 = season_counts(args.season_1, args)
+    _, counts_2 = season_counts(args.season_2, args)
+    if not args.quiet:
+        print_top(counts_1, args.season_1)
+        print_top(counts_2, args.season_2)
+    if args.json:
+        write_json(args.json, {args.season_1: counts_1, args.season_2: counts_2})
+    if args.csv:
+        write_csv(args.csv, counts_to_rows(counts_1, args.season_1) + counts_to_rows(counts_2, args.season_2))
+    if args.png:
+        write_png(args.png, plot_compared_seasons(counts_1, args.season_1, counts_2, args.season_2))
+
+
+# season paths for trends/forecast: the given seasons, or every stored season matching the filters
+def selected_seasons(args):
+    if args.seasons:
+        return seasons.chronological([season_location(season) for season in args.seasons])
+    years = seasons.parse_years(args.years) if args.years else None
+    paths = seasons.select(args.dir, args.type, args.cycle, years)
+    if not paths:
+        sys.exit(f"no stored seasons in {args.dir} match the selection")
+    return paths
+
+
+def cmd_trends(args):
+    import trend_prediction
+
+    files = selected_seasons(args)
+    matrices = trend_prediction.load_season_matrices(files, args.workers)
+    season_order = [m.to_counts() for m in matrices]
+    labels = trend_prediction.season_labels(files)
+    categories = args.category or list(KEYWORDS)
+
+    tables, rows = {}, []
+    for category in categories:
+        table = trend_prediction.trend_table(matrices, category, per=args.per, method=args.method,
+                                             alpha=args.alpha)
+        tables[category] = table
+        rows += [dict(category=category, item=item, **values)
+                 for item, values in table.to_dict('index').items()]
+        if not args.quiet:
+            for label in ('Rising', 'Declining'):
+                items = table.index[table['trend'] == label][:10]
+                print(f"{category} {label.lower()}: {', '.join(items) or '-'}")
+        if args.png:
+            fig = trend_prediction.plot_trends(table['trend'].to_dict(), season_order, category, labels,
+                                               matrices=matrices, per=args.per)
+            write_png(per_category(args.png, category, len(categories) > 1), fig)
+
+    if args.json:
+        write_json(args.json, {'seasons': labels,
+                               'trends': {c: t.reset_index().to_dict('records') for c, t in tables.items()}})
+    if args.csv:
+        write_csv(args.csv, rows)
+
+
+def cmd_forecast(args):
+    import forecast
+
+    # one season type by default: a spring menswear and a spring ready-to-wear season
+    # would otherwise share a seasonal slot
+    if not args.seasons and not args.type:
+        args.type = ['ready-to-wear']
+    files = selected_seasons(args)
+    table = forecast.forecast_seasons(files, args.category, args.horizon, args.method, args.per,
+                                      workers=args.workers)
+    if not args.quiet:
+        print(table.sort_values('forecast_1', ascending=False).head(20).to_string())
+    if args.json:
+        write_json(args.json, table.reset_index().to_dict('records'))
+    if args.csv:
+        write_csv(args.csv, table.reset_index().to_dict('records'))
+    if args.backtest:
+        try:
+            backtest = forecast.backtest_seasons(files, args.category, per=args.per, workers=args.workers)
+        except ValueError as e:
+            sys.exit(f"backtest: {e}")
+        print(backtest.to_string())
+
+
+# writes a season's scraped shows out as csv or json
+def cmd_export(args):
+    import scraper
+
+    path = season_location(args.season)
+    if not os.path.exists(path):
+        sys.exit(f"{args.season}: no stored data at {path}")
+    shows = list(store.iter_shows(path))
+    if args.csv:
+        scraper.save_to_csv(shows, args.csv)
+    if args.json:
+        write_json(args.json, shows)
+    if not (args.csv or args.json):
+        sys.exit("nothing to export: pass --csv and/or --json")
+
+
+def add_outputs(parser, png=True):
+    parser.add_argument('--json', metavar='PATH', help='write results as json')
+    parser.add_argument('--csv', metavar='PATH', help='write results as csv')
+    if png:
+        parser.add_argument('--png', metavar='PATH', help='save the plot as a png')
+
+
+def add_selection(parser):
+    parser.add_argument('seasons', nargs='*', help='season slugs or paths (default: every stored season)')
+    parser.add_argument('--dir', default='data', help='directory holding the season stores')
+    parser.add_argument('--type', action='append', choices=seasons.TYPES, help='only seasons of this type')
+    parser.add_argument('--cycle', action='append', choices=seasons.CYCLES, help='only seasons of this cycle')
+    parser.add_argument('--years', help='year range such as 2018-2025')
+    parser.add_argument('--per', default='show', choices=['show', 'tokens', 'none'],
+                        help='normalize mentions per show, per 10k tokens, or not at all')
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Scrape Vogue Runway seasons and analyze keyword trends.")
+    parser.add_argument('--workers', type=int, default=4, help='concurrent downloads / counting processes')
+    parser.add_argument('-q', '--quiet', action='store_true', help='no progress or summary output')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    p = sub.add_parser('scrape', help='scrape seasons into the local store')
+    p.add_argument('seasons', nargs='+')
+    p.add_argument('--full', action='store_true', help='rescrape every show instead of only new ones')
+    p.set_defaults(func=cmd_scrape)
+
+    p = sub.add_parser('analyze', help='keyword counts of one season')
+    p.add_argument('season')
+    p.add_argument('--scrape', action='store_true', help='scrape new shows of the season first')
+    add_outputs(p)
+    p.set_defaults(func=cmd_analyze)
+
+    p = sub.add_parser('compare', help='compare the keyword counts of two seasons')
+    p.add_argument('season_1')
+    p.add_argument('season_2')
+    p.add_argument('--scrape', action='store_true', help='scrape new shows of both seasons first')
+    add_outputs(p)
+    p.set_defaults(func=cmd_compare)
+
+    p = sub.add_parser('trends', help='rising/steady/declining terms across seasons')
+    add_selection(p)
+    p.add_argument('--category', action='append', choices=list(KEYWORDS), help='default: every category')
+    p.add_argument('--method', default='mann-kendall', choices=['mann-kendall', 'ols'],
+                   help='trend test (mann-kendall needs 5 seasons; fewer are tested with ols)')
+    p.add_argument('--alpha', type=float, default=0.05, help='significance level')
+    add_outputs(p)
+    p.set_defaults(func=cmd_trends)
+
+    p = sub.add_parser('forecast', help='forecast term mention rates for the next seasons '
+                                        '(ready-to-wear seasons unless --type or seasons are given)')
+    add_selection(p)
+    p.add_argument('--category', choices=list(KEYWORDS), help='default: the whole vocabulary')
+    p.add_argument('--horizon', type=int, default=2)
+    p.add_argument('--method', default='seasonal', choices=['naive', 'seasonal-naive', 'holt', 'seasonal'])
+    p.add_argument('--backtest', action='store_true', help='also print a backtest of every method')
+    add_outputs(p, png=False)
+    p.set_defaults(func=cmd_forecast)
+
+    p = sub.add_parser('export', help="write a season's scraped shows as csv/json")
+    p.add_argument('season')
+    add_outputs(p, png=False)
+    p.set_defaults(func=cmd_export)
+    return parser
+
+
+def main(argv=None):
+    # the Agg backend has to be chosen before pyplot is imported (plot.py imports it);
+    # choosing it here leaves the backend alone for whoever imports this module
+    import matplotlib
+    matplotlib.use("Agg")
+
+    args = build_parser().parse_args(argv)
+    if getattr(args, 'per', None) == 'none':
+        args.per = None
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+import os, json, hashlib
+import numpy as np
+from scipy import sparse
+import analyze, store
+
+# sidecar file name inside a season store (legacy csvs get <name>.counts.npz next to them)
+INDEX_NAME = '_counts.npz'
+
+
+def index_path(season_path):
+    if season_path.endswith('.csv'):
+        return season_path[:-len('.csv')] + '.counts.npz'
+    return os.path.join(season_path, INDEX_NAME)
+
+
+# files holding a season's review data
+def data_files(season_path):
+    return [season_path] if season_path.endswith('.csv') else store.part_files(season_path)
+
+
+# cheap fingerprint (name, size, mtime) used to skip hashing when nothing was touched
+def file_stats(files):
+    return json.dumps([[os.path.basename(f), os.path.getsize(f), os.stat(f).st_mtime_ns] for f in files])
+
+
+# sha256 over the contents of a season's data files
+def data_hash(files):
+    digest = hashlib.sha256()
+    for f in files:
+        digest.update(os.path.basename(f).encode())
+        with open(f, 'rb') as data:
+            for chunk in iter(lambda: data.read(1 << 20), b''):
+                digest.update(chunk)
+    return digest.hexdigest()
+
+
+def read_index(path):
+    try:
+        with np.load(path, allow_pickle=False) as index:
+            return {name: index[name] for name in index.files}
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+# saves the per-show matrix, season totals and both hashes to one compressed .npz
+def write_index(path, matrix, digest, stats):
+    csr = matrix.matrix
+    tmp = path + '.tmp'
+    with open(tmp, 'wb') as f:
+        np.savez_compressed(
+            f,
+            data=csr.data, indices=csr.indices, indptr=csr.indptr, shape=np.array(csr.shape),
+            designers=matrix.designers.astype(str), lengths=matrix.lengths,
+            totals=matrix.totals(),
+            vocabulary=np.array(analyze.VOCABULARY),
+            data_hash=np.array(digest), vocab_hash=np.array(analyze.VOCABULARY_HASH),
+            stats=np.array(stats),
+        )
+    os.replace(tmp, path)
+
+
+def _matrix_from_index(index):
+    csr = sparse.csr_matrix((index['data'], index['indices'], index['indptr']), shape=tuple(index['shape']))
+    return analyze.CountMatrix(csr, index['designers'].astype(object), index['lengths'])
+
+
+# returns a season's CountMatrix from its sidecar index, rebuilding the index
+# from the review data only when the data hash or the vocabulary hash changed
+def load_count_matrix(season_path, rebuild=False):
+    path = index_path(season_path)
+    files = data_files(season_path)
+    stats = file_stats(files)
+    index = None if rebuild else read_index(path)
+
+    digest = None
+    if index is not None and str(index['vocab_hash']) == analyze.VOCABULARY_HASH:
+        if str(index['stats']) == stats:
+            return _matrix_from_index(index)
+
+        # files were touched (e.g. copied); only rebuild if their content changed
+        digest = data_hash(files)
+        if str(index['data_hash']) == digest:
+            matrix = _matrix_from_index(index)
+            write_index(path, matrix, digest, stats)
+            return matrix
+
+    matrix = analyze.count_matrix_for_season(season_path)
+    write_index(path, matrix, digest or data_hash(files), stats)
+    return matrix
+
+
+# season keyword counts in the {category: Counter} layout of analyze.get_counts
+def load_season_counts(season_path):
+    return load_count_matrix(season_path).to_counts()
@@ -0,0 +1,246 @@
+import time
+from collections import namedtuple
+import numpy as np
+import pandas as pd
+from scipy.special import ndtri
+import trend_stats, trend_prediction, seasons
+from analyze import VOCABULARY, CATEGORY_COLUMNS
+
+# smoothing parameters tried for every term; each term keeps the combination
+# with the lowest one-step-ahead squared error
+ALPHAS = (0.1, 0.3, 0.5, 0.7, 0.9)
+BETAS = (0.01, 0.1, 0.3)
+GAMMAS = (0.05, 0.2, 0.5)
+
+# spring and fall alternate, so a spring/fall series repeats every two seasons
+DEFAULT_PERIOD = 2
+
+# the seasonal models below take phases: the seasonal slot (0 .. period - 1) of every
+# season, followed by the slots of the horizon seasons to forecast. by default the
+# series is taken to cycle strictly (slot t % period); season_phases() derives them
+# from the seasons' cycles instead, so a missing season does not shift the others.
+
+METHODS = ('naive', 'seasonal-naive', 'holt', 'seasonal')
+
+# mean: items x horizon point forecasts; lower/upper: prediction interval bounds
+Forecast = namedtuple('Forecast', 'mean lower upper')
+
+
+def _phases(phases, n, horizon, period):
+    if phases is None:
+        return np.arange(n + horizon) % period
+    return np.asarray(phases)[:n + horizon]
+
+
+# index of the last earlier season in the same slot for every season (-1 when none)
+# and of the last season in every slot
+def _slot_history(phases):
+    last, previous = {}, []
+    for t, k in enumerate(phases):
+        previous.append(last.get(k, -1))
+        last[k] = t
+    return np.array(previous, dtype=int), last
+
+
+def _intervals(mean, sigma, multipliers, level):
+    z = ndtri(0.5 + level / 2)
+    width = z * sigma[:, None] * np.sqrt(multipliers)
+    mean = np.maximum(mean, 0.0)
+    return Forecast(mean, np.maximum(mean - width, 0.0), mean + width)
+
+
+# last value carried forward; with period > 1, the last value of the same slot (seasonal naive)
+def naive(rates, horizon=2, period=1, level=0.95, phases=None):
+    rates = np.asarray(rates, dtype=float)
+    n = rates.shape[1]
+    steps = np.arange(horizon)
+    phases = _phases(phases, n, horizon, period)
+    previous, last = _slot_history(phases[:n].tolist())
+    # a slot not seen yet is forecast with the last season
+    mean = rates[:, [last.get(k, n - 1) for k in phases[n:].tolist()]]
+    seen = np.flatnonzero(previous >= 0)
+    errors = rates[:, seen] - rates[:, previous[seen]] if len(seen) else np.zeros((len(rates), 1))
+    sigma = np.sqrt((errors ** 2).mean(axis=1))
+    return _intervals(mean, sigma, steps // period + 1, level)
+
+
+# Holt's linear exponential smoothing fitted to every row at once.
+# all (alpha, beta) pairs run side by side as a (pairs, items) array, so the
+# time loop is the only python loop no matter how many terms are forecast.
+def holt(rates, horizon=2, level=0.95, alphas=ALPHAS, betas=BETAS):
+    rates = np.asarray(rates, dtype=float)
+    n = rates.shape[1]
+    if n < 3:
+        return naive(rates, horizon, level=level)
+
+    grid = np.array([(a, b) for a in alphas for b in betas])
+    a, b = grid[:, :1], grid[:, 1:]
+    lvl, trend = np.tile(rates[:, 0], (len(grid), 1)), np.tile(rates[:, 1] - rates[:, 0], (len(grid), 1))
+    sse = np.zeros_like(lvl)
+    for t in range(1, n):
+        y = rates[:, t]
+        sse += (y - lvl - trend) ** 2
+        new_level = a * y + (1 - a) * (lvl + trend)
+        trend = b * (new_level - lvl) + (1 - b) * trend
+        lvl = new_level
+
+    best = sse.argmin(axis=0)
+    items = np.arange(len(rates))
+    steps = np.arange(1, horizon + 1)
+    mean = lvl[best, items][:, None] + steps * trend[best, items][:, None]
+    sigma = np.sqrt(sse[best, items] / max(n - 3, 1))
+
+    # h-step variance multiplier of the additive error model
+    alpha, beta = grid[best, :1], grid[best, 1:]
+    c = alpha * (1 + np.arange(1, horizon) * beta)
+    multipliers = 1 + np.concatenate([np.zeros((len(rates), 1)), np.cumsum(c ** 2, axis=1)], axis=1)
+    return _intervals(mean, sigma, multipliers, level)
+
+
+# additive Holt-Winters smoothing with a seasonal component of length period
+# (2 separates the spring and fall cycles), fitted to every row at once
+def holt_winters(rates, horizon=2, period=DEFAULT_PERIOD, level=0.95, alphas=ALPHAS, betas=BETAS, gammas=GAMMAS,
+                 phases=None):
+    rates = np.asarray(rates, dtype=float)
+    n = rates.shape[1]
+    if n < 2 * period + 1:
+        return holt(rates, horizon, level, alphas, betas)
+    phases = _phases(phases, n, horizon, period)
+
+    grid = np.array([(a, b, g) for a in alphas for b in betas for g in gammas])
+    a, b, g = grid[:, :1], grid[:, 1:2], grid[:, 2:]
+    first, second = rates[:, :period].mean(axis=1), rates[:, period:2 * period].mean(axis=1)
+    lvl = np.tile(first, (len(grid), 1))
+    trend = np.tile((second - first) / period, (len(grid), 1))
+    # each slot starts at its first season's offset from the mean (0 when it is not in the first window)
+    start = np.zeros((len(rates), period))
+    for t in range(period - 1, -1, -1):
+        start[:, phases[t]] = rates[:, t] - first
+    seasonal = np.tile(start, (len(grid), 1, 1))
+    sse = np.zeros_like(lvl)
+    for t in range(period, n):
+        y, k = rates[:, t], phases[t]
+        sse += (y - lvl - trend - seasonal[:, :, k]) ** 2
+        new_level = a * (y - seasonal[:, :, k]) + (1 - a) * (lvl + trend)
+        trend = b * (new_level - lvl) + (1 - b) * trend
+        seasonal[:, :, k] = g * (y - new_level) + (1 - g) * seasonal[:, :, k]
+        lvl = new_level
+
+    best = sse.argmin(axis=0)
+    items = np.arange(len(rates))
+    steps = np.arange(1, horizon + 1)
+    slots = phases[n:]
+    mean = (lvl[best, items][:, None] + steps * trend[best, items][:, None]
+            + seasonal[best, items][:, slots])
+    sigma = np.sqrt(sse[best, items] / max(n - period - 3, 1))
+
+    alpha, beta, gamma = grid[best, :1], grid[best, 1:2], grid[best, 2:]
+    j = np.arange(1, horizon)
+    c = alpha * (1 + j * beta) + gamma * (j % period == 0)
+    multipliers = 1 + np.concatenate([np.zeros((len(rates), 1)), np.cumsum(c ** 2, axis=1)], axis=1)
+    return _intervals(mean, sigma, multipliers, level)
+
+
+# forecasts the next horizon seasons of every row with one of METHODS
+def forecast(rates, horizon=2, method='seasonal', period=DEFAULT_PERIOD, level=0.95, phases=None):
+    if method == 'naive':
+        return naive(rates, horizon, level=level)
+    if method == 'seasonal-naive':
+        return naive(rates, horizon, period, level, phases)
+    if method == 'holt':
+        return holt(rates, horizon, level)
+    if method == 'seasonal':
+        return holt_winters(rates, horizon, period, level, phases=phases)
+    raise ValueError(f"unknown forecast method: {method!r}")
+
+
+# rolling-origin backtest: every method is fitted on the first t seasons and scored on
+# the following horizon seasons, for every origin t from min_train on.
+# returns one row per method with MAE, RMSE, interval coverage and fitting time.
+def backtest(rates, horizon=1, min_train=6, methods=METHODS, period=DEFAULT_PERIOD, level=0.95, phases=None):
+    rates = np.asarray(rates, dtype=float)
+    n = rates.shape[1]
+    if n < min_train + horizon:
+        raise ValueError(f"backtesting needs at least {min_train + horizon} seasons "
+                         f"({min_train} to train on and {horizon} to forecast), got {n}")
+    rows = []
+    for method in methods:
+        errors, covered, seconds = [], [], 0.0
+        for t in range(min_train, n - horizon + 1):
+            start = time.perf_counter()
+            result = forecast(rates[:, :t], horizon, method, period, level,
+                              None if phases is None else phases[:t + horizon])
+            seconds += time.perf_counter() - start
+            actual = rates[:, t:t + horizon]
+            errors.append(result.mean - actual)
+            covered.append((result.lower <= actual) & (actual <= result.upper))
+        if not errors:
+            continue
+        errors = np.concatenate(errors, axis=1)
+        rows.append({'method': method, 'mae': np.abs(errors).mean(), 'rmse': np.sqrt((errors ** 2).mean()),
+                     'coverage': np.concatenate(covered, axis=1).mean(), 'origins': len(covered),
+                     'seconds': seconds})
+    return pd.DataFrame(rows).set_index('method')
+
+
+# terms x seasons mention rates of the given seasons (every vocabulary term, or one category)
+def season_rates(matrices, category=None, per='show'):
+    values = np.column_stack([m.totals() for m in matrices])
+    terms = np.array(VOCABULARY, dtype=object)
+    if category:
+        columns = CATEGORY_COLUMNS[category]
+        values, terms = values[columns], terms[columns]
+    shows, tokens = trend_stats.season_exposure(matrices)
+    return terms, trend_stats.normalize(values, shows, tokens, per)
+
+
+# seasonal slots of chronological season paths and of the horizon seasons after them, and
+# the number of slots: one per cycle the seasons belong to, in the order they are shown in
+# a year (so spring/fall ready-to-wear gives two). (None, period) when a file is not named
+# like a season, which leaves the series to cycle strictly.
+def season_phases(files, horizon, period=DEFAULT_PERIOD):
+    found = [seasons.season_of(f) if isinstance(f, str) else None for f in files]
+    if not found or None in found:
+        return None, period
+    # month of the year each cycle is first shown in
+    months = {}
+    for season in found:
+        month = seasons.SHOW_MONTHS[season.cycle, season.type] % 12
+        months[season.cycle] = min(months.get(season.cycle, month), month)
+    cycles = sorted(months, key=months.get)
+    slots = [cycles.index(season.cycle) for season in found]
+    future = [(slots[-1] + step) % len(cycles) for step in range(1, horizon + 1)]
+    return np.array(slots + future), len(cycles)
+
+
+# forecasts the mention rate of every term (or every term of a category) for the next
+# horizon seasons of a glob pattern, data directory or list of season paths.
+# the seasonal methods take each season's slot from its cycle (see season_phases)
+def forecast_seasons(file_pattern_or_list, category=None, horizon=2, method='seasonal', per='show',
+                     period=DEFAULT_PERIOD, level=0.95, workers=1):
+    files = trend_prediction.season_files(file_pattern_or_list)
+    terms, rates = season_rates(trend_prediction.load_season_matrices(files, workers), category, per)
+    phases, period = season_phases(files, horizon, period)
+    result = forecast(rates, horizon, method, period, level, phases)
+
+    table = {'last': rates[:, -1]}
+    for h in range(horizon):
+        table[f'forecast_{h + 1}'] = result.mean[:, h]
+        table[f'lower_{h + 1}'] = result.lower[:, h]
+        table[f'upper_{h + 1}'] = result.upper[:, h]
+    table = pd.DataFrame(table, index=pd.Index(terms, name='term'))
+    return table[rates.any(axis=1)]
+
+
+# backtests every method on the historical seasons of a glob pattern, directory or list
+def backtest_seasons(file_pattern_or_list, category=None, horizon=1, min_train=6, per='show',
+                     period=DEFAULT_PERIOD, workers=1):
+    files = trend_prediction.season_files(file_pattern_or_list)
+    _, rates = season_rates(trend_prediction.load_season_matrices(files, workers), category, per)
+    rates = rates[rates.any(axis=1)]
+    phases, period = season_phases(files, 0, period)
+    return backtest(rates, horizon, min_train, period=period, phases=phases)
+
+
+if __name__ == "__main__":
+    print(backtest_seasons("data"))
@@ -1,13 +1,39 @@
 import tkinter as tk
 from tkinter import messagebox, ttk
-from scraper import run_scraper_for_season  
-from analyze import analyze_single_season, compare_seasons
-from plot import plot_single_season, plot_compared_seasons
-import threading, requests, matplotlib
-from io import BytesIO
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-from PIL import ImageTk, Image
-matplotlib.use("TkAgg")
+import threading, time
+from jobs import JobManager
+
+# the scraper, pandas, matplotlib and PIL are imported where they are first used,
+# so the start page paints without waiting for them; preload() warms them up
+# once the window is on screen
+
+# delay before heavy modules are preloaded, so the first paint is not held up
+PRELOAD_DELAY_MS = 200
+
+
+# imports the analysis pipeline and the image libraries; run on a background thread
+def preload_modules():
+    import pipeline, thumbnails
+    from PIL import ImageTk
+
+
+# the TkAgg backend has to be chosen before pyplot is imported (plot.py imports it)
+def load_plotting():
+    import matplotlib
+    matplotlib.use("TkAgg")
+    import plot
+    from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+    return plot, FigureCanvasTkAgg
+
+
+# live results are redrawn after this many new shows or this many seconds,
+# but never more often than the minimum interval so the Tk loop stays responsive
+REDRAW_EVERY_SHOWS = 5
+REDRAW_EVERY_SECONDS = 5.0
+REDRAW_MIN_INTERVAL = 1.0
+
+# how often the Tk loop picks up messages from running jobs
+JOB_POLL_MS = 50
 
 
 # creates and displays main frame that holds all pages
@@ -32,21 +58,57 @@ class FashionTrendAnalyzer(tk.Tk):
         container.grid_rowconfigure(0, weight=1)
         container.grid_columnconfigure(0, weight=1)
 
+        # pipelines run on the job manager; their progress reaches the pages through poll_jobs
+        self.jobs = JobManager()
+        self.job = None
+
         self.frames = {}
 
         # standardizes setup for page classes
-        for F in (StartPage, AnalyzeOneSeasonPage, CompareTwoSeasonsPage, LoadingPage, ResultsPage):
+        for F in (StartPage, AnalyzeOneSeasonPage, CompareTwoSeasonsPage, TrendExplorerPage, LoadingPage, ResultsPage):
             frame = F(container, self)
             self.frames[F] = frame
             frame.grid(row=0, column=0, sticky="nsew")
 
         self.show_frame(StartPage)
+        self.after(PRELOAD_DELAY_MS, self.preload)
+        self.after(JOB_POLL_MS, self.poll_jobs)
+        self.protocol("WM_DELETE_WINDOW", self.close)
+
+    # warms up the heavy imports while the user is on the start page:
+    # the pipeline on a background thread, matplotlib's Tk backend on the Tk thread
+    def preload(self):
+        threading.Thread(target=preload_modules, daemon=True).start()
+        self.after_idle(load_plotting)
 
     # initializes display of frames
     def show_frame(self, page):
         frame = self.frames[page]
         frame.tkraise()
 
+    # runs fn(job, *args) as the job the pages show; a different job still running is cancelled,
+    # while repeating the same request while it runs just follows the running job
+    def start_job(self, key, fn, *args, listener):
+        if self.job is not None and self.job.key != key:
+            self.job.cancel()
+        self.job = self.jobs.submit(key, fn, *args, listener=listener)
+        return self.job
+
+    # stops the job the pages show (it finishes the show it is on, then stops)
+    def cancel_job(self):
+        if self.job is not None:
+            self.job.cancel()
+            self.job = None
+
+    # delivers job messages on the Tk thread
+    def poll_jobs(self):
+        self.jobs.poll()
+        self.after(JOB_POLL_MS, self.poll_jobs)
+
+    def close(self):
+        self.jobs.shutdown()
+        self.destroy()
+
 # Page 1 - title and navigation buttons
 class StartPage(tk.Frame):
     def __init__(self, parent, controller):
@@ -68,6 +130,11 @@ class StartPage(tk.Frame):
                                 command=lambda: controller.show_frame(CompareTwoSeasonsPage))
         compare_btn.pack(pady=10)
 
+        # upon action displays TrendExplorerPage with the seasons stored so far
+        trends_btn = tk.Button(self, text="explore trends", font=("Times", 12), width=25,
+                               command=lambda: controller.frames[TrendExplorerPage].open(controller))
+        trends_btn.pack(pady=10)
+
 
 # Page 2 - Runs analysis and plots data for a single runway season
 class AnalyzeOneSeasonPage(tk.Frame):
@@ -91,7 +158,7 @@ class AnalyzeOneSeasonPage(tk.Frame):
         back_btn = tk.Button(self, text="Back", font=("Times", 12), command=lambda: controller.show_frame(StartPage))
         back_btn.pack(pady=10)
 
-    # formats user-input and begins threading
+    # formats user-input and starts the pipeline job
     def run_analysis(self, controller):
 
         # formats user input for web search usability (to be used in scraper)
@@ -103,46 +170,102 @@ class AnalyzeOneSeasonPage(tk.Frame):
             return
 
         # displays loading page
+        loading_page = controller.frames[LoadingPage]
+        loading_page.show_bars(1)
+        loading_page.label.config(text="Gathering data . . .")
         controller.show_frame(LoadingPage)
 
-        # begins threading so data can be analyzed in backend while loading bar progesses on UI
-        thread = threading.Thread(target=self.run_pipeline, args=(show_name, controller), daemon=True)
-        thread.start()
-
-    # runs necessary functions for gathering desired data
-    def run_pipeline(self, season, controller):
-        try:
-
-            # loading page process begins
-            loading_page = controller.frames[LoadingPage]
-            controller.after(0, loading_page.label.config, {"text": "Gathering data . . ."})
-
-            # allows scraping data to be displayed on loading page
-            def progress_callback(current, total, show_name, cover_url):
-                controller.after(0, loading_page.update_status, current, total, show_name, cover_url)
-
-            # runs scraper to gather a csv file path for parsing
-            csv_path = run_scraper_for_season(season, progress_callback=progress_callback)
-
-            # changes loading page title
-            controller.after(0, loading_page.label.config, {"text": "Analyzing data . . ."})
-            results = analyze_single_season(csv_path)  
-
-            # clears previous sublabel and image
-            controller.after(0, loading_page.sublabel.config, {"text": ""})
-            controller.after(0, loading_page.clear_image)
+        # runs the pipeline on the job manager so data is analyzed in the backend while loading bar progresses on UI
+        controller.start_job(('analyze', show_name), self.run_pipeline, show_name,
+                             listener=JobView(controller, [show_name]))
+
+    # runs necessary functions for gathering desired data (on a job thread)
+    def run_pipeline(self, job, season):
+        from pipeline import run_season_pipeline
+        import thumbnails
+
+        # allows scraping data to be displayed on loading page
+        def progress_callback(current, total, show_name, cover_url):
+            # the cover starts downloading now, before the Tk loop gets to the update
+            if cover_url:
+                thumbnails.get_loader().prefetch(cover_url)
+            job.update('status', current, total, show_name, cover_url)
+
+        # redraws the results page with the counts so far while scraping continues
+        partial_callback = PartialRedraw(job)
+
+        # scrapes the season, counting keywords as each show arrives; stops between shows once cancelled
+        season_path, results = run_season_pipeline(season, progress_callback=progress_callback,
+                                                   partial_callback=partial_callback, incremental=True,
+                                                   cancel=job.cancel_event)
+        return [results]
+
+# throttles live redraws of a season's partial results.
+# called from the pipeline thread after every show; the snapshot is sent as a job update,
+# so a redraw the Tk loop has not got to yet is replaced by the newer one instead of queueing up.
+class PartialRedraw:
+    def __init__(self, job):
+        self.job = job
+        self.last_shows = 0
+        self.last_time = time.monotonic()
+
+    def __call__(self, counts, done):
+        elapsed = time.monotonic() - self.last_time
+        if elapsed < REDRAW_MIN_INTERVAL:
+            return
+        if done - self.last_shows < REDRAW_EVERY_SHOWS and elapsed < REDRAW_EVERY_SECONDS:
+            return
 
-            # re-sets progress bar
-            controller.after(0, loading_page.reset_progress)
-            
-            # when data is loaded result page is displayed
-            results_page = controller.frames[ResultsPage]
-            controller.after(0, results_page.display_results, results, season, False)
-            controller.after(0, controller.show_frame, ResultsPage)
+        self.last_shows = done
+        self.last_time = time.monotonic()
+        self.job.update('partial', counts.snapshot(), done)
+
+# shows a job's messages on the loading and results pages; called on the Tk loop.
+# only the view of the job the user is waiting on draws, so a cancelled or
+# replaced run cannot overwrite the pages of the current one.
+class JobView:
+    def __init__(self, controller, seasons):
+        self.controller = controller
+        self.seasons = seasons
+        self.shown = False
+
+    def __call__(self, kind, *payload):
+        job = self.controller.job
+        if job is None or job.listeners[-1] is not self:
+            return
+        loading_page = self.controller.frames[LoadingPage]
+        results_page = self.controller.frames[ResultsPage]
+
+        if kind == 'status':
+            loading_page.update_status(*payload)
+
+        elif kind == 'season_done':
+            loading_page.season_done(*payload)
+
+        # counts so far; opens the results page on the first partial draw only, so Back still works
+        elif kind == 'partial':
+            results, done = payload
+            results_page.display_results(results, self.seasons[0], False, shows_so_far=done)
+            if not self.shown:
+                self.controller.show_frame(ResultsPage)
+                self.shown = True
+
+        # when data is loaded result page is displayed
+        elif kind == 'done':
+            self.controller.job = None
+            loading_page.clear_image()
+            loading_page.reset_progress()
+            results = payload[0]
+            if len(results) > 1:
+                results_page.display_results(results[0], self.seasons[0], True, results[1], self.seasons[1])
+            else:
+                results_page.display_results(results[0], self.seasons[0], False)
+            self.controller.show_frame(ResultsPage)
 
         # error message displays if error occurs in scraping proccess
-        except Exception as e:
-            controller.after(0, messagebox.showerror, "Error", str(e))
+        elif kind == 'error':
+            self.controller.job = None
+            messagebox.showerror("Error", str(payload[0]))
 
 # Page 3 - runs analysis and plots data for a comparison of two seasons
 class CompareTwoSeasonsPage(tk.Frame):
@@ -181,100 +304,232 @@ class CompareTwoSeasonsPage(tk.Frame):
             messagebox.showwarning("Missing Input", "Please enter a season.")
             return
 
-        # displays loading page
+        # displays loading page, with one progress bar per season
+        loading_page = controller.frames[LoadingPage]
+        loading_page.show_bars(2)
+        loading_page.label.config(text="Gathering data for both seasons . . .")
         controller.show_frame(LoadingPage)
 
-        # begins threading so data can be analyzed in backend while loading bar progesses on UI
-        thread = threading.Thread(target=self.run_pipeline, args=(season_1, season_2, controller), daemon=True)
-        thread.start()
-
-    def run_pipeline(self, season_1, season_2, controller):
-        try:
-
-            # loading page process begins
-            loading_page = controller.frames[LoadingPage]
-            controller.after(0, loading_page.label.config, {"text": "Gathering season one data . . ."})
-
-            # allows scraping data to be displayed on loading page
-            def progress_callback(current, total, show_name, cover_url):
-                controller.after(0, loading_page.update_status, current, total, show_name, cover_url)
-
-            # runs scraper to gather a csv file path for parsing
-            csv_path_1 = run_scraper_for_season(season_1, progress_callback=progress_callback)
-
-            # loading page displays that season two data scraping has begun
-            controller.after(0, loading_page.label.config, {"text": "Gathering season two data . . ."})
-
-            # clears previous sublabel and image
-            controller.after(0, loading_page.sublabel.config, {"text": ""})
-            controller.after(0, loading_page.clear_image)
-
-            # re-sets progress bar
-            controller.after(0, loading_page.reset_progress)
-
-            # runs scraper to gather a csv file path for parsing
-            csv_path_2 = run_scraper_for_season(season_2, progress_callback=progress_callback)
-
-            # changes text displayed on loading page
-            controller.after(0, loading_page.label.config, {"text": "Analyzing data . . ."})
-            results = compare_seasons(csv_path_1, csv_path_2)  
-
-            # clears previous sublabel and image
-            controller.after(0, loading_page.sublabel.config, {"text": ""})
-            controller.after(0, loading_page.clear_image)
+        # runs the pipeline on the job manager so data is analyzed in the backend while loading bars progress on UI
+        controller.start_job(('compare', season_1, season_2), self.run_pipeline, season_1, season_2,
+                             listener=JobView(controller, [season_1, season_2]))
+
+    # runs on a job thread
+    def run_pipeline(self, job, season_1, season_2):
+        from pipeline import run_seasons_pipeline
+        import thumbnails
+
+        # allows scraping data of either season to be displayed on loading page
+        def progress_callback(index, current, total, show_name, cover_url):
+            # the cover starts downloading now, before the Tk loop gets to the update
+            if cover_url:
+                thumbnails.get_loader().prefetch(cover_url)
+            job.update('status', current, total, show_name, cover_url, index, key=('status', index))
+
+        # a season's counts are final once its own scrape ends, even if the other is still running
+        def season_callback(index, season_path, results):
+            job.post('season_done', index)
+
+        # scrapes both seasons at once under one shared rate budget, counting keywords as shows arrive
+        (season_path_1, results_1), (season_path_2, results_2) = run_seasons_pipeline(
+            [season_1, season_2], progress_callback, season_callback, incremental=True,
+            cancel=job.cancel_event)
+        return [results_1, results_2]
+
+# Page 4 - trends of a category across any set of stored seasons.
+# the chosen seasons are counted once (on a job thread) and kept for the session,
+# so switching categories only rescores and redraws the embedded trend plots
+class TrendExplorerPage(tk.Frame):
+    def __init__(self, parent, controller):
+        super().__init__(parent, bg="#EECACA")
 
-            # re-sets progress bar
-            controller.after(0, loading_page.reset_progress)
+        label = tk.Label(self, text="EXPLORE TRENDS ACROSS SEASONS", font=("Arial", 18, "bold"), bg="#EECACA")
+        label.pack(pady=(20, 10))
+
+        controls = tk.Frame(self, bg="#EECACA")
+        controls.pack(pady=5)
+
+        # list of stored seasons; several can be selected
+        seasons_frame = tk.Frame(controls, bg="#EECACA")
+        seasons_frame.pack(side=tk.LEFT, padx=10)
+        self.season_list = tk.Listbox(seasons_frame, selectmode=tk.MULTIPLE, exportselection=False,
+                                      font=("Times", 12), width=30, height=8)
+        scrollbar = tk.Scrollbar(seasons_frame, command=self.season_list.yview)
+        self.season_list.config(yscrollcommand=scrollbar.set)
+        self.season_list.pack(side=tk.LEFT)
+        scrollbar.pack(side=tk.LEFT, fill=tk.Y)
+
+        buttons = tk.Frame(controls, bg="#EECACA")
+        buttons.pack(side=tk.LEFT, padx=10)
+
+        # category picker; a new category is drawn as soon as it is picked
+        self.category = tk.StringVar()
+        self.category_box = ttk.Combobox(buttons, textvariable=self.category, state="readonly",
+                                         font=("Times", 12), width=20)
+        self.category_box.bind("<<ComboboxSelected>>", lambda event: self.category_changed())
+        self.category_box.pack(pady=5)
+
+        # upon action calls show_trends function
+        self.show_btn = tk.Button(buttons, text="Show Trends", font=("Times", 12), width=20,
+                                  command=lambda: self.show_trends(controller))
+        self.show_btn.pack(pady=5)
 
-            # when data is loaded result page is displayed
-            results_page = controller.frames[ResultsPage]
-            controller.after(0, results_page.display_results, results[0], season_1, True, results[1], season_2)
-            controller.after(0, controller.show_frame, ResultsPage)
+        # upon action displays start page
+        back_btn = tk.Button(buttons, text="Back", font=("Times", 12), command=lambda: self.back(controller))
+        back_btn.pack(pady=5)
+
+        self.status = tk.Label(self, text="", font=("Times", 12, "italic"), bg="#EECACA")
+        self.status.pack(pady=5)
+
+        # adds frame to place the trend plots onto; the figure and its canvas are made once
+        self.plot_frame = tk.Frame(self, bg="#EECACA")
+        self.plot_frame.pack(expand=True, fill=tk.BOTH)
+        self.fig = None
+        self.canvas = None
+
+        self.paths = []
+        # SeasonTrends of the last counted selection, and the selection the user asked for last
+        self.trends = None
+        self.wanted = None
+
+    # lists the stored seasons and the categories, then displays the page
+    def open(self, controller):
+        import seasons
+        from analyze import KEYWORDS
+
+        self.paths = seasons.select()
+        self.season_list.delete(0, tk.END)
+        for path in self.paths:
+            self.season_list.insert(tk.END, seasons.label(path))
+        self.category_box["values"] = list(KEYWORDS)
+        if not self.category.get():
+            self.category.set(next(iter(KEYWORDS)))
+        self.status.config(text="" if self.paths else "No seasons stored yet: analyze a season first.")
+        controller.show_frame(TrendExplorerPage)
+
+    def back(self, controller):
+        if controller.job is not None and controller.job.key[0] == 'trends':
+            controller.cancel_job()
+        controller.show_frame(StartPage)
+
+    # draws the chosen category, counting the chosen seasons first if they are not the ones in memory
+    def show_trends(self, controller):
+        selection = tuple(self.paths[i] for i in self.season_list.curselection())
+        from trend_stats import min_seasons
+        # the explorer scores with SeasonTrends' default test
+        minimum = min_seasons()
+        if len(selection) < minimum:
+            messagebox.showwarning("Missing Input", f"Please select at least {minimum} seasons.")
+            return
 
-        # error message displays if error occurs in scraping proccess
-        except Exception as e:
-            controller.after(0, messagebox.showerror, "Error", str(e))
+        self.wanted = selection
+        if self.trends is not None and tuple(self.trends.files) == selection:
+            self.draw()
+            return
 
-# Page 4 - Results Page that displays final matplotlib plots of data
+        self.status.config(text=f"Counting {len(selection)} seasons . . .")
+        self.show_btn.config(state=tk.DISABLED)
+        controller.start_job(('trends', selection), self.count_seasons, selection,
+                             listener=lambda kind, *payload: self.job_message(controller, selection, kind, *payload))
+
+    # runs on a job thread
+    def count_seasons(self, job, selection):
+        from trend_prediction import SeasonTrends
+        return SeasonTrends(list(selection))
+
+    # served from the seasons in memory, when they are the ones selected
+    def category_changed(self):
+        if self.trends is not None and tuple(self.trends.files) == self.wanted:
+            self.draw()
+
+    def job_message(self, controller, selection, kind, *payload):
+        if kind in ('done', 'error') and controller.job is not None and controller.job.key == ('trends', selection):
+            controller.job = None
+        if kind in ('done', 'error'):
+            self.show_btn.config(state=tk.NORMAL)
+        if kind == 'done':
+            self.trends = payload[0]
+            if tuple(self.trends.files) == self.wanted:
+                self.draw()
+        elif kind == 'error':
+            self.status.config(text="")
+            messagebox.showerror("Error", str(payload[0]))
+        # (unless the seasons are already being counted again)
+        elif kind == 'cancelled' and (controller.job is None or controller.job.key[0] != 'trends'):
+            self.status.config(text="")
+            self.show_btn.config(state=tk.NORMAL)
+
+    def draw(self):
+        plot, FigureCanvasTkAgg = load_plotting()
+        from matplotlib.figure import Figure
+
+        if self.fig is None:
+            self.fig = Figure(figsize=(10, 5.2))
+            self.canvas = FigureCanvasTkAgg(self.fig, master=self.plot_frame)
+            self.canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+
+        category = self.category.get()
+        self.trends.plot(category, fig=self.fig)
+        self.canvas.draw_idle()
+        from trend_stats import trend_test
+        n_seasons = len(self.trends.files)
+        test = "Mann-Kendall" if trend_test(self.trends.method, n_seasons) == 'mann-kendall' else "least-squares"
+        self.status.config(text=f"{category.capitalize()} across {n_seasons} seasons ({test} trend test)")
+
+# Page 5 - Results Page that displays final matplotlib plots of data
 class ResultsPage(tk.Frame):
     def __init__(self, parent, controller):
         super().__init__(parent, bg="#F5E9E9")
-        # upon interaction displays start page
-        back_btn = tk.Button(self, text="Back", command=lambda: controller.show_frame(StartPage))
+        # upon interaction stops any scrape still filling in these results and displays start page
+        back_btn = tk.Button(self, text="Back", command=lambda: self.back(controller))
         back_btn.pack(side=tk.TOP, anchor=tk.NE) 
 
         # title of page
         self.label = tk.Label(self, text="Analysis Results", font=("Arial", 18, "bold"), bg = "#F5E9E9")
         self.label.pack(pady=5)
 
-        # adds frame to place matplotlib plot onto
+        # adds frame to place matplotlib plot onto; the figure and its canvas are made once
+        # and updated in place by every run
         self.plot_frame = tk.Frame(self, bg="#F5E9E9")
         self.plot_frame.pack(expand=True, fill = tk.BOTH)
+        self.plot = None
+        self.canvas = None
+
+    def back(self, controller):
+        controller.cancel_job()
+        controller.show_frame(StartPage)
 
-        
 
-    def display_results(self, results_1, season_1, compare, results_2= '', season_2 = ''):
+    def display_results(self, results_1, season_1, compare, results_2= '', season_2 = '', shows_so_far=None):
+        plot, FigureCanvasTkAgg = load_plotting()
+
+        # partial results show how many shows they are based on
+        if shows_so_far is None:
+            self.label.config(text="Analysis Results")
+        else:
+            self.label.config(text=f"Analysis Results (so far: {shows_so_far} shows, still loading . . .)")
+
+        if self.plot is None:
+            self.plot = plot.KeywordPlot(animated=True)
+            self.canvas = FigureCanvasTkAgg(self.plot.fig, master=self.plot_frame)
+            self.canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
 
-        # removes any existing plots from frame
-        for widget in self.plot_frame.winfo_children():
-            widget.destroy()
-        
         # if season comparison was made display comparison graphs
         if compare:
-            fig = plot_compared_seasons(results_1, season_1, results_2, season_2)
+            full = self.plot.update(results_1, season_1, results_2, season_2, live=shows_so_far is not None)
 
         # if single season was analyzed display single season graphs
         else:
-            fig = plot_single_season(results_1, season_1)
+            full = self.plot.update(results_1, season_1, live=shows_so_far is not None)
 
-        canvas = FigureCanvasTkAgg(fig, master=self.plot_frame)
-        canvas.draw()
-        canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+        # partial redraws are blitted panel by panel unless the layout has to change
+        self.plot.draw(full)
 
 # Temp Page
 class LoadingPage(tk.Frame):
     def __init__(self, parent, controller):
         super().__init__(parent, bg="#E8C5C5")
+        self.controller = controller
 
         self.grid_rowconfigure(0, weight=1)
         self.grid_columnconfigure(0, weight=1)
@@ -301,39 +556,90 @@ class LoadingPage(tk.Frame):
         self.sublabel = tk.Label(content, text="", font=("Times", 12, "italic"), bg="#E8C5C5")
         self.sublabel.pack(pady=5)
 
+        # second bar and subtitle, shown while two seasons are scraped side by side
+        self.second = tk.Frame(content, bg="#E8C5C5")
+        self.progress_2 = ttk.Progressbar(self.second, orient="horizontal",
+                        length=300, style = 'pink.Horizontal.TProgressbar', mode="determinate")
+        self.progress_2.pack(pady=5)
+        self.sublabel_2 = tk.Label(self.second, text="", font=("Times", 12, "italic"), bg="#E8C5C5")
+        self.sublabel_2.pack(pady=5)
+
         self.image_label = tk.Label(content, bg="#E8C5C5")
         self.image_label.pack(pady=5)
         self.current_img = None
 
+        # upon action stops the running scrape and displays start page
+        cancel_btn = tk.Button(content, text="Cancel", font=("Times", 12), command=self.cancel)
+        cancel_btn.pack(pady=10)
+
+        # covers are numbered as they are requested; one only replaces the cover on screen
+        # if it belongs to a later show, so late downloads for passed shows are dropped
+        self.cover_requested = 0
+        self.cover_shown = 0
+
+    def cancel(self):
+        self.controller.cancel_job()
+        self.clear_image()
+        self.reset_progress()
+        self.controller.show_frame(StartPage)
+
     def clear_image(self):
         self.image_label.config(image="", text="")
         self.image_label.image = None  # drop reference
+        self.current_img = None
+        self.cover_shown = self.cover_requested
 
     def reset_progress(self):
-        self.progress["value"] = 0
-    
-    # update loading bar and sublabel dynamically
-    def update_status(self, current, total, show_name, cover_url=None):
-        self.sublabel.config(text=f"Loading Show {current}/{total}: {show_name}")
-        self.progress["value"] = (current / total) * 100
+        for bar, sublabel in self.bars():
+            bar["value"] = 0
+            sublabel.config(text="")
+
+    # (progress bar, subtitle) of each season
+    def bars(self):
+        return [(self.progress, self.sublabel), (self.progress_2, self.sublabel_2)]
+
+    # shows one progress bar, or two when seasons are compared
+    def show_bars(self, count):
+        self.reset_progress()
+        if count > 1:
+            self.second.pack(before=self.image_label)
+        else:
+            self.second.pack_forget()
+
+    def season_done(self, index):
+        bar, sublabel = self.bars()[index]
+        bar["value"] = 100
+        sublabel.config(text=f"Season {('one', 'two')[index]} ready")
+
+    # update loading bar and sublabel dynamically (index picks the season's bar)
+    def update_status(self, current, total, show_name, cover_url=None, index=0):
+        bar, sublabel = self.bars()[index]
+        sublabel.config(text=f"Loading Show {current}/{total}: {show_name}")
+        bar["value"] = (current / total) * 100
 
         if cover_url:
-                try:
-                    response = requests.get(cover_url, timeout=5)
-                    response.raise_for_status()
-                    print(f"Fetching cover for {show_name}: {cover_url}, status={response.status_code}")
-                    pil_img = Image.open(BytesIO(response.content))
-                    pil_img = pil_img.resize((167, 251))  
-                    self.current_img = ImageTk.PhotoImage(pil_img)
-                    self.image_label.config(image=self.current_img)
-
-                    # force refresh
-                    self.update_idletasks()  
-
-                except Exception as e:
-                    print(f"Could not load cover image for {show_name}: {e}")
-                    self.image_label.config(image="")  # fallback: clear image
+            self.show_cover(cover_url)
+
+    # loads the cover on the thumbnail pool; the Tk thread only turns it into a PhotoImage
+    def show_cover(self, cover_url):
+        import thumbnails
+
+        self.cover_requested += 1
+        number = self.cover_requested
+        thumbnails.get_loader().load(cover_url, lambda url, image: self.controller.jobs.call_soon(
+            self.cover_ready, number, image))
+
+    def cover_ready(self, number, image):
+        if number <= self.cover_shown:
+            return
+        self.cover_shown = number
+        if image is None:
+            self.image_label.config(image="")  # fallback: clear image
+            return
 
+        from PIL import ImageTk
+        self.current_img = ImageTk.PhotoImage(image)
+        self.image_label.config(image=self.current_img)
 
 if __name__ == "__main__":
     app = FashionTrendAnalyzer()
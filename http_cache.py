@@ -0,0 +1,170 @@
+import os, json, gzip, time, hashlib, threading
+
+# where cached show pages and cover images live
+CACHE_DIR = os.path.join('data', 'cache', 'http')
+
+# runway reviews rarely change after publication, so entries stay fresh for a month
+DEFAULT_TTL = 30 * 24 * 3600
+
+# total compressed size kept on disk before least recently used entries are evicted
+DEFAULT_MAX_BYTES = 500 * 1024 * 1024
+
+# response headers worth keeping with a cached body
+KEPT_HEADERS = ('Content-Type', 'ETag', 'Last-Modified')
+
+
+# raised in offline mode when a URL has never been cached
+class CacheMiss(Exception):
+    pass
+
+
+# writes bytes to path atomically so readers never see a half-written file
+def _write_atomic(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp, 'wb') as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+# content-addressed response cache.
+# bodies are gzipped and stored once per sha256 of their content under objects/,
+# and index/ holds one small json entry per URL pointing at its body.
+class ResponseCache:
+    def __init__(self, directory=CACHE_DIR, ttl=DEFAULT_TTL, max_bytes=DEFAULT_MAX_BYTES):
+        self.directory = directory
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        self.size = None
+
+    def _entry_path(self, url):
+        key = hashlib.sha256(url.encode()).hexdigest()
+        return os.path.join(self.directory, 'index', key[:2], key + '.json')
+
+    def _object_path(self, digest):
+        return os.path.join(self.directory, 'objects', digest[:2], digest + '.gz')
+
+    # returns the cached entry for url, or None
+    def lookup(self, url):
+        try:
+            with open(self._entry_path(url)) as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not os.path.exists(self._object_path(entry['digest'])):
+            return None
+        return entry
+
+    def is_fresh(self, entry):
+        return time.time() - entry['stored_at'] < self.ttl
+
+    # conditional request headers that let the server answer 304 Not Modified
+    def validators(self, entry):
+        headers = {}
+        if entry.get('ETag'):
+            headers['If-None-Match'] = entry['ETag']
+        if entry.get('Last-Modified'):
+            headers['If-Modified-Since'] = entry['Last-Modified']
+        return headers
+
+    def read_body(self, entry):
+        with open(self._object_path(entry['digest']), 'rb') as f:
+            return gzip.decompress(f.read())
+
+    # saves a 200 response body and its entry, then evicts if over budget
+    def store(self, url, status, headers, body):
+        digest = hashlib.sha256(body).hexdigest()
+        object_path = self._object_path(digest)
+        now = time.time()
+
+        with self.lock:
+            added = 0
+            if not os.path.exists(object_path):
+                data = gzip.compress(body, compresslevel=6)
+                _write_atomic(object_path, data)
+                added = len(data)
+
+            entry = {'url': url, 'digest': digest, 'status': status,
+                     'stored_at': now, 'accessed_at': now}
+            entry.update({name: headers[name] for name in KEPT_HEADERS if name in headers})
+            _write_atomic(self._entry_path(url), json.dumps(entry).encode())
+
+            if self.size is not None:
+                self.size += added
+        self.evict()
+        return entry
+
+    # marks an entry as used now; refresh also restarts its TTL (after a 304)
+    def touch(self, url, entry, refresh=False):
+        entry['accessed_at'] = time.time()
+        if refresh:
+            entry['stored_at'] = entry['accessed_at']
+        with self.lock:
+            _write_atomic(self._entry_path(url), json.dumps(entry).encode())
+
+    def _scan(self):
+        entries, objects = [], {}
+        for root, _, files in os.walk(os.path.join(self.directory, 'index')):
+            for name in files:
+                path = os.path.join(root, name)
+                try:
+                    with open(path) as f:
+                        entries.append((path, json.load(f)))
+                except (OSError, ValueError):
+                    os.remove(path)
+        for root, _, files in os.walk(os.path.join(self.directory, 'objects')):
+            for name in files:
+                if name.endswith('.gz'):
+                    objects[name[:-3]] = os.path.getsize(os.path.join(root, name))
+        return entries, objects
+
+    # removes least recently used entries (and their unreferenced bodies)
+    # until the cache fits in max_bytes
+    def evict(self):
+        with self.lock:
+            if self.size is not None and self.size <= self.max_bytes:
+                return
+
+            entries, objects = self._scan()
+            referenced = {entry['digest'] for _, entry in entries}
+            for digest in set(objects) - referenced:
+                os.remove(self._object_path(digest))
+                del objects[digest]
+
+            size = sum(objects.values())
+            entries.sort(key=lambda item: item[1].get('accessed_at', 0))
+            while size > self.max_bytes and entries:
+                path, entry = entries.pop(0)
+                os.remove(path)
+                digest = entry['digest']
+                if digest in objects and all(e['digest'] != digest for _, e in entries):
+                    os.remove(self._object_path(digest))
+                    size -= objects.pop(digest)
+            self.size = size
+
+    # removes every cached entry and body
+    def clear(self):
+        with self.lock:
+            entries, objects = self._scan()
+            for path, _ in entries:
+                os.remove(path)
+            for digest in objects:
+                os.remove(self._object_path(digest))
+            self.size = 0
+
+
+_cache = None
+
+# replaces the process-wide cache (e.g. to point it at another directory)
+def set_cache(cache):
+    global _cache
+    _cache = cache
+
+
+# returns the process-wide cache
+def get_cache():
+    global _cache
+    if _cache is None:
+        _cache = ResponseCache()
+    return _cache
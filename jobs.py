@@ -0,0 +1,133 @@
+import queue, threading
+from concurrent.futures import ThreadPoolExecutor, wait
+
+# pipelines that may run at the same time (a comparison counts as one)
+DEFAULT_MAX_JOBS = 2
+
+
+# one background run (e.g. scraping and analyzing a season).
+# the running function checks cancel_event between shows and stops cooperatively;
+# it reports back with post() (every message is delivered) or update() (only the
+# newest message per key is delivered, for progress that may outpace the UI;
+# the key defaults to the message kind).
+class Job:
+    def __init__(self, manager, key):
+        self.manager = manager
+        self.key = key
+        self.cancel_event = threading.Event()
+        self.listeners = []
+        self.future = None
+        self._updates = {}
+
+    @property
+    def cancelled(self):
+        return self.cancel_event.is_set()
+
+    def cancel(self):
+        self.cancel_event.set()
+
+    def post(self, kind, *payload):
+        self.manager.queue.put((self, kind, payload))
+
+    def update(self, kind, *payload, key=None):
+        key = kind if key is None else key
+        with self.manager.lock:
+            queued = key in self._updates
+            self._updates[key] = (kind, payload)
+        if not queued:
+            self.manager.queue.put((self, None, key))
+
+    def _take_update(self, key):
+        with self.manager.lock:
+            return self._updates.pop(key, (None, ()))
+
+
+# runs jobs on a bounded pool and hands their messages to the Tk thread through one queue.
+# identical requests (same key) share the running job instead of starting another;
+# a new job for the key of a cancelled one waits for it to wind down first, so two runs
+# never write the same season at once. call poll() regularly from the Tk loop.
+class JobManager:
+    def __init__(self, max_jobs=DEFAULT_MAX_JOBS):
+        self.pool = ThreadPoolExecutor(max_workers=max_jobs, thread_name_prefix='job')
+        self.queue = queue.SimpleQueue()
+        self.lock = threading.Lock()
+        self.active = {}
+
+    # runs fn(job, *args) unless a job with the same key is already running, in which
+    # case that job is returned. listener(kind, *payload) is called on the polling thread
+    # for every message; the final one is ('done', result), ('error', exception) or ('cancelled',).
+    def submit(self, key, fn, *args, listener=None):
+        with self.lock:
+            job = self.active.get(key)
+            if job is not None and not job.cancelled:
+                if listener:
+                    job.listeners.append(listener)
+                return job
+
+            previous = job
+            job = Job(self, key)
+            if listener:
+                job.listeners.append(listener)
+            self.active[key] = job
+            job.future = self.pool.submit(self._run, job, previous, fn, args)
+        return job
+
+    def _run(self, job, previous, fn, args):
+        try:
+            if previous is not None:
+                wait([previous.future])
+            if job.cancelled:
+                job.post('cancelled')
+                return
+            job.post('done', fn(job, *args))
+        except Exception as e:
+            if job.cancelled:
+                job.post('cancelled')
+            else:
+                job.post('error', e)
+        finally:
+            with self.lock:
+                if self.active.get(job.key) is job:
+                    del self.active[job.key]
+
+    # runs fn(*args) on the polling thread, e.g. to hand a result from a worker to Tk
+    def call_soon(self, fn, *args):
+        self.queue.put((None, fn, args))
+
+    def cancel(self, key):
+        with self.lock:
+            job = self.active.get(key)
+        if job is not None:
+            job.cancel()
+
+    def cancel_all(self):
+        with self.lock:
+            jobs = list(self.active.values())
+        for job in jobs:
+            job.cancel()
+
+    # delivers queued messages; progress of cancelled jobs is dropped, only their final
+    # message gets through. returns the number of messages delivered.
+    def poll(self, limit=500):
+        delivered = 0
+        while delivered < limit:
+            try:
+                job, kind, payload = self.queue.get_nowait()
+            except queue.Empty:
+                break
+            if job is None:
+                kind(*payload)
+            else:
+                if kind is None:
+                    kind, payload = job._take_update(payload)
+                final = kind in ('done', 'error', 'cancelled')
+                if kind is None or (job.cancelled and not final):
+                    continue
+                for listener in list(job.listeners):
+                    listener(kind, *payload)
+            delivered += 1
+        return delivered
+
+    def shutdown(self):
+        self.cancel_all()
+        self.pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,82 @@
+import os, threading
+from contextlib import closing
+import scraper, store, catalog, seasons
+from concurrent.futures import ThreadPoolExecutor
+from analyze import clean_text, SeasonCounts
+
+
+# raised by the pipeline when its cancel event is set. the store is left as after any
+# other error: a full rescrape is discarded, an incremental one keeps the shows it appended.
+class Cancelled(Exception):
+    pass
+
+
+_season_locks = {}
+_season_locks_lock = threading.Lock()
+
+# one pipeline at a time may write a season's store
+def season_lock(season_string):
+    with _season_locks_lock:
+        return _season_locks.setdefault(season_string, threading.Lock())
+
+
+# scrapes a season and analyzes it in one pass.
+# each show is cleaned and counted as soon as it is scraped and appended to
+# the season store as a side output, so nothing is re-read afterwards.
+# partial_callback(counts, done) receives the running SeasonCounts after every show.
+# cancel (a threading.Event) is checked between shows.
+# returns the store path and the final keyword counts.
+def run_season_pipeline(season_string, progress_callback=None, partial_callback=None,
+                        workers=scraper.DEFAULT_WORKERS, incremental=False, cancel=None):
+    season_path = store.season_path(season_string)
+    counts = SeasonCounts()
+    failed = []
+    shows = catalog.get_catalog()
+
+    with season_lock(season_string):
+        # a season scraped before the stores existed is migrated from its csv first,
+        # so an incremental run keeps its shows instead of scraping them all again
+        legacy = store.legacy_path(season_path)
+        if not os.path.exists(season_path) and os.path.exists(legacy):
+            store.migrate_csv(legacy)
+        with store.ShowWriter(season_path, replace=not incremental) as out, \
+                closing(scraper.iter_season(season_string, progress_callback, workers, incremental, failed)) as new_shows:
+            for show in new_shows:
+                if cancel is not None and cancel.is_set():
+                    raise Cancelled(season_string)
+                if not show.get('cleaned_review'):
+                    show['cleaned_review'] = clean_text(show['review'] or '')
+                counts.add(show['cleaned_review'])
+                shows.add_show(season_string, show, season_path, replace=not show.get('stored'))
+                if not show.get('stored'):
+                    out.append(show)
+
+                if partial_callback:
+                    partial_callback(counts, counts.shows)
+
+        scraper.save_failed_shows(season_path, failed)
+        seasons.save_info(season_path, season_string, counts.shows)
+    return season_path, counts.snapshot()
+
+
+# runs the pipeline for several seasons at once, one thread per season.
+# every season's requests go through the same per-host limiter, so together they stay
+# within one rate budget, and a season's counts are final as soon as its own scrape ends.
+# progress_callback(index, done, total, designer, cover_image) reports per season;
+# season_callback(index, season_path, counts) fires when a season finishes, while the
+# others may still be scraping. returns [(season_path, counts)] in the order given.
+def run_seasons_pipeline(season_strings, progress_callback=None, season_callback=None,
+                         workers=scraper.DEFAULT_WORKERS, incremental=False, cancel=None):
+    def run(index, season_string):
+        def progress(done, total, designer, cover_image):
+            progress_callback(index, done, total, designer, cover_image)
+
+        result = run_season_pipeline(season_string, progress if progress_callback else None,
+                                     workers=workers, incremental=incremental, cancel=cancel)
+        if season_callback:
+            season_callback(index, *result)
+        return result
+
+    with ThreadPoolExecutor(max_workers=max(1, len(season_strings))) as pool:
+        futures = [pool.submit(run, index, season) for index, season in enumerate(season_strings)]
+        return [future.result() for future in futures]
@@ -1,99 +1,218 @@
-import matplotlib.pyplot as plt
+import math
 import matplotlib.ticker as ticker
 from matplotlib import rc
-
-# organizes and plots category data for single given dataset/season
-def plot_single_season(counts, season):
-
-    # re-formats season string
-    title_season = season.replace('-', ' ').title()
-
-    # sets font for display
-    rc('font', **{'family': "Times New Roman"}) 
-
-    # configures display grid for multiple data plots
-    fig, axes = plt.subplots(nrows = 2, ncols = 3, figsize = (12, 8))
-
-    # adds a title to the grid
-    fig.suptitle('Top Fashion Keywords in ' + title_season + ' Runway Reviews', fontsize=16, y=0.99)
-
-    # plots data on grid for all categories
-    plot_data(axes[0, 0], counts.get('colors'), 'Color Mentions', '#FFEDF1', False)
-    plot_data(axes[0, 1], counts.get('fabrics'), 'Fabric Mentions', '#EBCFCC', False)
-    plot_data(axes[0, 2], counts.get('details'), 'Detail Mentions', '#EADCDC', False)
-    plot_data(axes[1, 0], counts.get('silhouettes'), 'Silhouette Mentions', '#E8D6D4', False)
-    plot_data(axes[1, 1], counts.get('pieces'), 'Clothing Item Mentions', '#F4EBE9', False)
-    plot_data(axes[1, 2], counts.get('patterns'), 'Pattern Mentions', '#FFEDED', False)
-
-    plt.tight_layout()
-    #plt.show()
-    return fig
-
-# organizes, plots, and compares top data from two datasets/seasons
-def plot_compared_seasons(counts_1, season_1, counts_2, season_2):
-
-    # reformats seasons strings
-    title_season_1 = season_1.replace('-', ' ').title()
-    title_season_2 = season_2.replace('-', ' ').title()
-
-    # sets font for display
-    rc('font', **{'family': "Times New Roman"}) 
-
-    # configures display grid for multiple data plots
-    fig, axes = plt.subplots(nrows = 2, ncols = 3, figsize = (12, 8))
-
-    # adds title to grid
-    fig.suptitle('Comparison of Top Keywords in ' + title_season_1 + ' vs ' + title_season_2 + ' Runway Reviews', 
-                   fontsize = 14, y = 0.99)
-    
-    # plots data for each keyword category for both reviews
-    plot_data(axes[0, 0], counts_1.get('colors'), 'Top Colors', '#FFEDF1', True, counts_2.get('colors'))
-    plot_data(axes[0, 1], counts_1.get('fabrics'), 'Top Fabrics', '#FFEDF1', True, counts_2.get('fabrics'))
-    plot_data(axes[0, 2], counts_1.get('details'), 'Top Details', '#FFEDF1', True, counts_2.get('details'))
-    plot_data(axes[1, 0], counts_1.get('silhouettes'), 'Top Silhouettes', '#FFEDF1', True, counts_2.get('silhouettes'))
-    plot_data(axes[1, 1], counts_1.get('pieces'), 'Top Pieces', '#FFEDF1', True, counts_2.get('pieces'))
-    plot_data(axes[1, 2], counts_1.get('patterns'), 'Top Patterns', '#FFEDF1', True, counts_2.get('patterns'))
-
-    plt.tight_layout()
-    #plt.show()
-    return fig
-    
-    
-# plots given data on grid
-# counts_2 is optional as is only used when comparing two data sets
-def plot_data(ax, counts_1, title, color, compare, counts_2 = {}):
-
-    # for comparing two data sets
-    if compare:
-
-        # gets top keywords for current category of each season
-        common_1 = counts_1.most_common(1)
-        common_2 = counts_2.most_common(1)
-
-        # uses two distinct colors for each season
-        colors = [color, '#EBCFCC']
-
-        # plots the bars for each season
-        ax.bar(['S1', 'S2'],  [common_1[0][1], common_2[0][1]],  color = colors)
+from matplotlib.figure import Figure
+from matplotlib.transforms import Bbox
+from collections import Counter
+
+# figures are plain matplotlib Figures rather than pyplot ones, so nothing keeps them
+# alive once their owner drops them (pyplot holds on to every figure until it is closed)
+
+# (category, title on a single season plot, title on a comparison, bar color) of each panel
+PANELS = [
+    ('colors', 'Color Mentions', 'Top Colors', '#FFEDF1'),
+    ('fabrics', 'Fabric Mentions', 'Top Fabrics', '#EBCFCC'),
+    ('details', 'Detail Mentions', 'Top Details', '#EADCDC'),
+    ('silhouettes', 'Silhouette Mentions', 'Top Silhouettes', '#E8D6D4'),
+    ('pieces', 'Clothing Item Mentions', 'Top Pieces', '#F4EBE9'),
+    ('patterns', 'Pattern Mentions', 'Top Patterns', '#FFEDED'),
+]
+
+# bar colors of the two seasons in a comparison
+COMPARE_COLORS = ['#FFEDF1', '#EBCFCC']
+
+# live plots leave this much room above the tallest bar, so growing counts
+# rarely change the y axis
+LIVE_HEADROOM = 2.0
+
+# accepts either get_counts-style {category: Counter} dicts or an analyze.CountMatrix
+def as_counts(counts):
+    return counts.to_counts() if hasattr(counts, 'to_counts') else counts
+
+# re-formats season string
+def title_season(season):
+    return season.replace('-', ' ').title()
+
+
+# the keyword charts of one season or of a comparison, kept on one figure and updated in place:
+# new counts change the heights and labels of the existing bars instead of building a new figure.
+# with animated=True (for a canvas on screen) the bars and axes are drawn over a saved background
+# and redraws are blitted panel by panel: a panel whose bars only grew repaints just its bars,
+# one with new labels or a new y range also repaints its own axes. the whole figure is laid out
+# and drawn again only when a panel's labels outgrow the space the layout gave them.
+# live updates keep the bars in place while the same terms are on top, so labels change rarely.
+class KeywordPlot:
+    def __init__(self, fig=None, animated=False):
+        self.fig = fig if fig is not None else Figure(figsize=(12, 8))
+        self.animated = animated
+        self.compare = None
+        self.axes = []
+        self.bars = []
+        self.labels = []
+        self.title = None
+        self.canvas = None
+        self.background = None
+        # screen area of each panel (axes and tick labels) when the figure was last laid out
+        self.regions = []
+        # panels whose axes changed since they were last drawn
+        self.dirty = set()
+
+    # new grid of empty panels
+    def _build(self, compare):
+        # sets font for display
+        rc('font', **{'family': "Times New Roman"})
+
+        self.fig.clear()
+        self.axes = list(self.fig.subplots(nrows=2, ncols=3).flat)
+        for ax in self.axes:
+            ax.xaxis.set_animated(self.animated)
+            ax.yaxis.set_animated(self.animated)
+        self.bars = [None] * len(self.axes)
+        self.labels = [None] * len(self.axes)
+        self.title = None
+        self.background = None
+        self.compare = compare
+
+    # sets one panel's bars. returns 'layout' when the figure has to be laid out again,
+    # 'axes' when the panel's labels or y range changed, None when only bar heights did
+    def _update_panel(self, i, labels, heights, colors, title, live):
+        ax, bars = self.axes[i], self.bars[i]
+        changed = None
+
+        # creates a bar for each word (only when the number of bars changed)
+        if bars is None or len(bars) != len(heights):
+            if bars is not None:
+                bars.remove()
+            bars = self.bars[i] = ax.bar(range(len(heights)), heights, color=colors, animated=self.animated)
+            ax.set_title(title, fontsize=14)
+            ax.set_ylabel('Mentions')
+            ax.yaxis.set_major_locator(ticker.MaxNLocator(integer=True))
+            changed = 'layout'
+        else:
+            for bar, height in zip(bars, heights):
+                bar.set_height(height)
 
         # adds labels and tickers
-        ax.set_xticks(range(2))
-        ax.set_xticklabels([common_1[0][0], common_2[0][0]], rotation=45, ha='right')
-       
-    # for analyzing a single season
-    else:
-
-        # gets top 10 words for each keyword category
-        items = dict(counts_1.most_common(10))
+        if labels != self.labels[i]:
+            ax.set_xticks(range(len(labels)))
+            ax.set_xticklabels(labels, rotation=45, ha='right')
+            self.labels[i] = labels
+            changed = changed or 'axes'
+
+        top = max(max(heights, default=0), 1)
+        ylim = ax.get_ylim()[1]
+        if changed or top > ylim or not live and ylim != top * 1.05:
+            ax.set_ylim(0, top * (LIVE_HEADROOM if live else 1.05))
+            changed = changed or 'axes'
+        return changed
+
+    # shows the counts of a season, or compares two seasons' top keywords when counts_2 is given.
+    # live: the counts are partial and will be updated again soon.
+    # returns True when the layout changed and the whole figure has to be redrawn.
+    def update(self, counts_1, season_1, counts_2=None, season_2=None, live=False):
+        compare = counts_2 is not None
+        if compare != self.compare:
+            self._build(compare)
+        counts_1 = as_counts(counts_1)
+        counts_2 = as_counts(counts_2) if compare else None
+
+        changes = []
+        for i, (category, single_title, compare_title, color) in enumerate(PANELS):
+            # gets top keywords for current category of each season
+            if compare:
+                top = [((counts.get(category) or Counter()).most_common(1) or [('', 0)])[0]
+                       for counts in (counts_1, counts_2)]
+                labels, heights = [item for item, _ in top], [num for _, num in top]
+                changes.append(self._update_panel(i, labels, heights, COMPARE_COLORS, compare_title, live))
+
+            # gets top 10 words for each keyword category
+            # (while live, in the order already shown as long as they are the same words)
+            else:
+                category_counts = counts_1.get(category) or Counter()
+                labels = [item for item, _ in category_counts.most_common(10)]
+                if live and self.labels[i] and set(labels) == set(self.labels[i]):
+                    labels = self.labels[i]
+                heights = [category_counts[item] for item in labels]
+                changes.append(self._update_panel(i, labels, heights, color, single_title, live))
+
+        # adds a title to the grid
+        if compare:
+            title = (f"Comparison of Top Keywords in {title_season(season_1)} vs "
+                     f"{title_season(season_2)} Runway Reviews")
+        else:
+            title = f"Top Fashion Keywords in {title_season(season_1)} Runway Reviews"
+        if title != self.title:
+            self.fig.suptitle(title, fontsize=14 if compare else 16, y=0.99)
+            self.title = title
+            changes.append('layout')
+
+        # final counts are always laid out afresh, so the finished plot looks as if drawn from scratch
+        if 'layout' in changes or not live and 'axes' in changes:
+            self.fig.tight_layout()
+            self.dirty.clear()
+            return True
+        self.dirty.update(i for i, change in enumerate(changes) if change == 'axes')
+        return False
+
+    def _draw_panel(self, i, axes=True):
+        ax = self.axes[i]
+        if axes:
+            ax.draw_artist(ax.xaxis)
+            ax.draw_artist(ax.yaxis)
+        for bar in self.bars[i] or ():
+            ax.draw_artist(bar)
+
+    # after every full draw (including the ones the canvas makes by itself, e.g. on resize)
+    # the background without the bars and axes is saved and they are drawn over it
+    def _on_draw(self, event):
+        renderer = event.renderer
+        self.background = self.canvas.copy_from_bbox(self.fig.bbox)
+        self.regions = [Bbox.union([ax.bbox, ax.get_tightbbox(renderer)]).padded(1) for ax in self.axes]
+        self.dirty.clear()
+        for i in range(len(self.axes)):
+            self._draw_panel(i)
+
+    # draws the figure on its canvas: all of it when full, otherwise panel by panel
+    def draw(self, full=True):
+        canvas = self.fig.canvas
+        if self.animated and canvas is not self.canvas:
+            canvas.mpl_connect('draw_event', self._on_draw)
+            self.canvas = canvas
+
+        if not self.animated or full or self.background is None:
+            canvas.draw()
+            return
+
+        # new labels that need more room than their panel had are laid out again
+        renderer = canvas.get_renderer()
+        for i in self.dirty:
+            bbox = self.axes[i].get_tightbbox(renderer)
+            if not self.regions[i].contains(bbox.x0, bbox.y0) or not self.regions[i].contains(bbox.x1, bbox.y1):
+                self.fig.tight_layout()
+                canvas.draw()
+                return
+
+        # (the saved background counts pixel rows from the top)
+        height = self.fig.bbox.height
+        for i, ax in enumerate(self.axes):
+            axes = i in self.dirty
+            x0, y0, x1, y1 = (self.regions[i] if axes else ax.bbox).extents
+            bbox = (math.ceil(x0), math.ceil(height - y1), math.floor(x1), math.floor(height - y0))
+            canvas.restore_region(self.background, bbox=bbox, xy=(0, 0))
+            self._draw_panel(i, axes)
+        self.dirty.clear()
+        canvas.blit(self.fig.bbox)
 
-        # creates bar for each word
-        ax.bar(items.keys(), items.values(), color=color)
 
-        # adds labels and tickers
-        ax.set_xticks(range(len(items)))
-        ax.set_xticklabels(items.keys(), rotation=45, ha='right')
+# organizes and plots category data for single given dataset/season
+# fig: figure to draw into (a new one when omitted)
+def plot_single_season(counts, season, fig=None):
+    plot = KeywordPlot(fig)
+    plot.update(counts, season)
+    return plot.fig
 
-    # adds titles
-    ax.set_title(title, fontsize=14)
-    ax.set_ylabel('Mentions')
-    ax.yaxis.set_major_locator(ticker.MaxNLocator(integer=True))
\ No newline at end of file
+# organizes, plots, and compares top data from two datasets/seasons
+def plot_compared_seasons(counts_1, season_1, counts_2, season_2, fig=None):
+    plot = KeywordPlot(fig)
+    plot.update(counts_1, season_1, counts_2, season_2)
+    return plot.fig
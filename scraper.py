@@ -1,94 +1,223 @@
 from bs4 import BeautifulSoup
-import pandas as pd
-import time, requests
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.service import Service
-from webdriver_manager.chrome import ChromeDriverManager
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
+import lxml.html
+import os, re, csv, json, time, threading
+import transport, store
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from urllib.parse import urljoin, urlparse
 
-HEADERS = {'User-Agent': 'Mozilla/5.0'}
+# statuses that mean the host wants us to slow down (or is struggling)
+RETRY_STATUSES = set(transport.RETRY_STATUSES)
+
+# default politeness settings per host: (requests per second, max in-flight requests)
+HOST_LIMITS = {'www.vogue.com': (2.0, 4)}
+DEFAULT_LIMIT = (2.0, 4)
+
+# number of show pages fetched at once by scrape_all_shows
+DEFAULT_WORKERS = 4
+
+# incremental runs stop retrying a show after it failed this many runs in a row
+# (e.g. a show whose review is never published); it stays listed in _failed.json
+MAX_FAILED_ATTEMPTS = 5
+
+BASE_ORIGIN = "https://www.vogue.com"
+
+
+# token-bucket rate limiter shared by every request to one host.
+# on 429/5xx responses (or responses that needed retries) the rate is halved, and it slowly climbs back
+# to the configured rate after successful responses.
+class RateLimiter:
+    def __init__(self, rate=2.0, max_in_flight=4, burst=1, min_rate=0.1):
+        self.max_rate = rate
+        self.rate = rate
+        self.min_rate = min(min_rate, rate)
+        self.capacity = max(1, burst)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+        self.slots = threading.BoundedSemaphore(max_in_flight)
+
+    # blocks until a request slot and a token are both available
+    def acquire(self):
+        self.slots.acquire()
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+    # frees the request slot and adapts the rate to the response status
+    def release(self, status=None, retries=0):
+        with self.lock:
+            if status in RETRY_STATUSES or retries:
+                self.rate = max(self.min_rate, self.rate / 2)
+                self.tokens = 0
+            elif status is not None:
+                self.rate = min(self.max_rate, self.rate + self.max_rate * 0.1)
+        self.slots.release()
+
+
+_limiters = {}
+_limiters_lock = threading.Lock()
+
+# returns the shared limiter for a host, creating it on first use
+def host_limiter(host):
+    with _limiters_lock:
+        if host not in _limiters:
+            rate, max_in_flight = HOST_LIMITS.get(host, DEFAULT_LIMIT)
+            _limiters[host] = RateLimiter(rate, max_in_flight)
+        return _limiters[host]
+
+
+# builds a show entry from a link found on a collection page,
+# or returns None when the link does not point at a show in this collection
+def show_from_link(href, base_path, name=None, img_url=None):
+    full = urljoin(BASE_ORIGIN, href)
+    path = urlparse(full).path.rstrip("/")
+
+    # keep only designer pages directly under THIS collection (e.g., /fashion-shows/mexico-fall-2025/<designer>)
+    if not path.startswith(base_path + "/") or "/" in path[len(base_path) + 1:]:
+        return None
+
+    name = (name or "").strip() or path.split("/")[-1].replace("-", " ").title()
+    return {"designer": name, "url": BASE_ORIGIN + path, "image_url": img_url}
+
+
+# show entries of this collection from (href, name, img_url) links, in first-seen order.
+# a show is often linked more than once (a bare image link, then its heading), so a later
+# link fills in the name and image an earlier one lacked
+def collect_shows(links, base_path):
+    shows, named = {}, set()
+    for href, name, img_url in links:
+        show = show_from_link(href, base_path, name, img_url)
+        if show is None:
+            continue
+        url = show["url"]
+        if url not in shows:
+            shows[url] = show
+        elif url not in named and (name or "").strip():
+            shows[url]["designer"] = show["designer"]
+        if (name or "").strip():
+            named.add(url)
+        if shows[url]["image_url"] is None:
+            shows[url]["image_url"] = img_url
+    return list(shows.values())
+
+
+# matches collection links inside embedded json, where "/" may be escaped as \u002F
+JSON_LINK = r'(?:https:(?:\\u002F|/){2}www\.vogue\.com)?{path}(?:\\u002F|/)[a-z0-9-]+(?=["?#\\])'
+
+# every dict in a parsed json document that has a "url" string, as (url, hed, image)
+def json_items(node):
+    if isinstance(node, dict):
+        url, image = node.get('url'), node.get('image')
+        if isinstance(url, str):
+            hed = node.get('hed') or node.get('name')
+            yield url, hed if isinstance(hed, str) else None, image if isinstance(image, str) else None
+        for value in node.values():
+            yield from json_items(value)
+    elif isinstance(node, list):
+        for value in node:
+            yield from json_items(value)
+
+# (href, name, img_url) of the links in one script: the items of its json document first
+# (when it holds one), then every other link the pattern finds in its text
+def script_links(text, pattern):
+    links = []
+    start = text.find('{')
+    if start >= 0:
+        try:
+            links += json_items(json.JSONDecoder().raw_decode(text, start)[0])
+        except ValueError:
+            pass
+    return links + [(match.group(0).replace("\\u002F", "/"), None, None) for match in pattern.finditer(text)]
+
+# finds show links in the collection page's server-rendered html and its embedded json state
+def parse_show_links(html, collection_url):
+    base_path = urlparse(collection_url).path.rstrip("/")
+    tree = lxml.html.fromstring(html)
+
+    # server-rendered cards: prefer the summary heading, then the link text
+    links = []
+    for a in tree.iterfind(".//a[@href]"):
+        heading = a.find('.//h3[@data-testid="SummaryItemHed"]')
+        img = a.find(".//img")
+        links.append((a.get("href"), heading.text_content() if heading is not None else a.text_content(),
+                      img.get("src") if img is not None else None))
+
+    # embedded state picks up cards that are only rendered client-side,
+    # with the heading and image of each item as the rendered card shows them
+    json_path = re.escape(base_path).replace("/", r"(?:\\u002F|/)")
+    pattern = re.compile(JSON_LINK.replace("{path}", json_path))
+    for script in tree.iterfind(".//script"):
+        links += script_links(script.text or "", pattern)
+
+    return collect_shows(links, base_path)
+
+
+# fast discovery without a browser; collection pages change during fashion week, so their
+# cached copy is always revalidated (and served as is in offline mode)
+def get_show_links_static(collection_url):
+    try:
+        response = transport.get(collection_url, revalidate=True)
+    except Exception as e:
+        print(f"Failed to fetch collection page: {e}")
+        return []
+    if response.status_code != 200:
+        return []
+    return parse_show_links(response.content, collection_url)
 
-def get_show_links_selenium(collection_url):
-    print("Launching browser to get show links...")
 
-    options = webdriver.ChromeOptions()
-    options.add_argument("--headless=new")
-    options.add_argument("--disable-gpu")
-    options.add_argument("--no-sandbox")
-    options.add_argument("--window-size=1920,1080")
-    driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=options)
+# uses the static extractor and only launches a browser when it finds nothing
+# (and never in offline mode, where the browser could not load the page either)
+def get_show_links(collection_url):
+    shows = get_show_links_static(collection_url)
+    if shows:
+        print(f"Found {len(shows)} valid designer shows.")
+        return shows
+    if transport.OFFLINE:
+        print("Offline: no cached collection page to find shows in.")
+        return []
+    return get_show_links_selenium(collection_url)
 
-    driver.get(collection_url)
-    shows, seen = [], set()
 
-    try:
-        WebDriverWait(driver, 15).until(EC.presence_of_element_located((By.TAG_NAME, "body")))
-
-        # light scroll to trigger any lazy content
-        driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-        time.sleep(0.8)
-        driver.execute_script("window.scrollTo(0, 0);")
-
-        base_path = urlparse(collection_url).path.rstrip("/")
-        base_origin = "https://www.vogue.com"
-
-        # search broadly, then refine to links under the collection path.
-        candidates_css = [
-            f'a[href^="{base_path}/"]',
-            f'a[href^="{base_origin}{base_path}/"]',
-            'nav[data-testid="navigation"] ul li a',
-            'a[class^="SummaryItemHedLink"]',
-            'a.card-article-link',
-
-            # final catch-all
-            'a[href*="/fashion-shows/"]',  
-        ]
-
-        total_found = 0
-
-        # finds amount of links using css structure used in vogue website
-        for css in candidates_css:
-            elems = driver.find_elements(By.CSS_SELECTOR, css)
-            if not elems:
-                continue
-            total_found += len(elems)
-
-            for a in elems:
-                href = a.get_attribute("href")
-                if not href:
-                    continue
+# collects every anchor on the page in one round-trip as [href, name, img_src]
+ANCHORS_SCRIPT = """
+return Array.from(document.querySelectorAll('a[href]')).map(function (a) {
+    var heading = a.querySelector('h3[data-testid="SummaryItemHed"]');
+    var img = a.querySelector('img');
+    return [a.getAttribute('href'), heading ? heading.textContent : a.innerText, img ? img.src : null];
+});
+"""
 
-                full = urljoin(base_origin, href)
-                path = urlparse(full).path
+# selenium is only imported when the static parse finds nothing, since it is slow to load
+def get_show_links_selenium(collection_url):
+    import browser_pool
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support.ui import WebDriverWait
+    from selenium.webdriver.support import expected_conditions as EC
 
-                # keep only links under THIS collection (e.g., /fashion-shows/mexico-fall-2025/...)
-                if not (path.startswith(base_path + "/")):
-                    continue
-                if full in seen:
-                    continue
+    print("Using browser to get show links...")
 
-                # prefer visible text, then <h3 data-testid="SummaryItemHed">, then URL slug.
-                name = (a.text or "").strip()
-                if not name:
-                    try:
-                        name = a.find_element(By.CSS_SELECTOR, 'h3[data-testid="SummaryItemHed"]').text.strip()
-                    except Exception:
-                        name = path.split("/")[-1].replace("-", " ").title()
+    try:
+        with browser_pool.get_pool().driver() as driver:
+            driver.get(collection_url)
+            WebDriverWait(driver, 15).until(EC.presence_of_element_located((By.TAG_NAME, "body")))
 
-                # try to grab a thumbnail if present.
-                img_url = None
-                try:
-                    img_url = a.find_element(By.TAG_NAME, "img").get_attribute("src")
-                except Exception:
-                    pass
+            # light scroll to trigger any lazy content
+            driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+            time.sleep(0.8)
+            driver.execute_script("window.scrollTo(0, 0);")
 
-                shows.append({"designer": name, "url": full, "image_url": img_url})
-                seen.add(full)
+            anchors = driver.execute_script(ANCHORS_SCRIPT)
 
-        print(f"Total anchors scanned: {total_found}")
+        shows = collect_shows(anchors, urlparse(collection_url).path.rstrip("/"))
+
+        print(f"Total anchors scanned: {len(anchors)}")
         print(f"Found {len(shows)} valid designer shows.")
         return shows
 
@@ -96,13 +225,28 @@ def get_show_links_selenium(collection_url):
         print(f"Failed to collect show links: {e}")
         return []
 
-    finally:
-        driver.quit()
-
 # scrapes the desired data for an individual show link
-def scrape_show_page(show):
+def scrape_show_page(show, limiter=None):
     url = show['url']
-    response = requests.get(url, headers=HEADERS)
+    limiter = limiter or host_limiter(urlparse(url).netloc)
+
+    # cached pages never reach the host, so they skip the rate limiter
+    if transport.is_cached(url):
+        response = transport.get(url)
+        status = response.status_code
+    else:
+        status, retries = None, 0
+        limiter.acquire()
+        try:
+            response = transport.get(url)
+            status, retries = response.status_code, transport.retry_count(response)
+        finally:
+            limiter.release(status, retries)
+
+    # the transport already retried these, so give up on the show
+    if status in RETRY_STATUSES:
+        response.raise_for_status()
+
     soup = BeautifulSoup(response.content, 'lxml')
 
     # title or collection name
@@ -143,52 +287,149 @@ def scrape_show_page(show):
     }
 
 
-# iterates through all links and scrapes desired data for each one
-def scrape_all_shows(show_links, progress_callback=None):
-    all_data = []
-    for i, show in enumerate(show_links):
-        
-        # displays what show is currently being scraped
-        print(f"Scraping {i+1}/{len(show_links)}: {show['designer']}")
+# scrapes show links on a pool of worker threads and yields them as they become available.
+# requests are paced by the per-host limiter, progress_callback is called as
+# each show finishes and shows are yielded in the order of show_links.
+# at most a few pages per worker are in flight or buffered, so memory stays flat.
+# shows that could not be scraped, or whose page had no review text yet, are not yielded
+# but appended to failed when it is given (with the number of runs they have failed in),
+# so the next incremental run retries them.
+def iter_scraped_shows(show_links, progress_callback=None, workers=DEFAULT_WORKERS, limiter=None, failed=None):
+    total = len(show_links)
+    window = max(1, workers) * 4
+    pool = ThreadPoolExecutor(max_workers=max(1, workers))
+    pending, ready = {}, {}
+    next_submit = next_yield = done = 0
 
-        try:
-            show_data = scrape_show_page(show)
+    try:
+        while next_yield < total:
+            while next_submit < total and next_submit - next_yield < window:
+                pending[pool.submit(scrape_show_page, show_links[next_submit], limiter)] = next_submit
+                next_submit += 1
 
-            if progress_callback:
-                progress_callback(i+1, len(show_links), show_data['designer'], show_data['cover_image'])
+            finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in finished:
+                i = pending.pop(future)
+                show = show_links[i]
+                done += 1
 
-            all_data.append(show_data)
+                # displays what show has just been scraped
+                print(f"Scraped {done}/{total}: {show['designer']}")
+
+                try:
+                    show_data = future.result()
+                except Exception as e:
+                    print(f"Error scraping {show['designer']}: {e}")
+                    if failed is not None:
+                        failed.append(dict(show, error=str(e), attempts=show.get('attempts', 0) + 1))
+                    ready[i] = None
+                    continue
 
-        except Exception as e:
-            print(f"Error scraping {show['designer']}: {e}")
+                if progress_callback:
+                    progress_callback(done, total, show_data['designer'], show_data['cover_image'])
 
-        # takes randomized breaks to not alarm vogue websites servers 
-        time.sleep(1)  
-    return all_data
+                # the review is often published after the show page itself; the retry goes
+                # through the cache, whose TTL and revalidation pick up the updated page
+                if not show_data['review'] or show_data['review'] == 'N/A':
+                    print(f"No review yet for {show['designer']}")
+                    if failed is not None:
+                        failed.append(dict(show, error='no review text', attempts=show.get('attempts', 0) + 1))
+                    ready[i] = None
+                    continue
+                ready[i] = show_data
 
-def save_to_csv(data, filename='fashion_shows.csv'):
-    flat_data = []
-    for entry in data:
-        flat_data.append({
-            'Designer': entry['designer'],
-            'Collection Name': entry['collection_name'],
-            'URL': entry['collection_url'],
-            'Cover Image': entry['cover_image'],
-            'Review': entry['review'],
-        })
-    df = pd.DataFrame(flat_data)
-    df.to_csv(filename, index=False)
-    print(f"Data saved to {filename}")
+            # hands out every show whose predecessors are all done
+            while next_yield in ready:
+                show_data = ready.pop(next_yield)
+                next_yield += 1
+                if show_data is not None:
+                    yield show_data
 
-def run_scraper_for_season(season_string, progress_callback=None):
-    season_path = f"data/{season_string.replace('-', '_')}_shows.csv"
-    collection_url = f"https://www.vogue.com/fashion-shows/{season_string}"
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
 
-    show_links = get_show_links_selenium(collection_url)
 
-    all_shows = scrape_all_shows(show_links, progress_callback=progress_callback)
-    save_to_csv(all_shows, season_path)
-    return season_path
+# scrapes every show link and returns the results in the order of show_links
+def scrape_all_shows(show_links, progress_callback=None, workers=DEFAULT_WORKERS, limiter=None, failed=None):
+    return list(iter_scraped_shows(show_links, progress_callback, workers, limiter, failed))
+
+# writes the shows to csv (e.g. to export a season)
+def save_to_csv(data, filename='fashion_shows.csv'):
+    os.makedirs(os.path.dirname(filename) or '.', exist_ok=True)
+    with open(filename, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(store.COLUMNS.values())
+        for entry in data:
+            writer.writerow(entry.get(key) for key in store.COLUMNS)
+    print(f"Data saved to {filename}")
 
+# shows that failed in the last run of a season, kept inside its store
+def failed_shows_path(season_path):
+    return os.path.join(season_path, '_failed.json')
 
+def load_failed_shows(season_path):
+    try:
+        with open(failed_shows_path(season_path)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return []
 
+def save_failed_shows(season_path, failed):
+    path = failed_shows_path(season_path)
+    if not failed:
+        if os.path.exists(path):
+            os.remove(path)
+        return
+    os.makedirs(season_path, exist_ok=True)
+    with open(path + '.tmp', 'w') as f:
+        json.dump(failed, f, indent=2)
+    os.replace(path + '.tmp', path)
+
+# yields every show of a season in store order.
+# with incremental=True the shows already stored come first (marked 'stored'), followed by
+# new links and shows that failed last time; otherwise the whole season is scraped.
+def iter_season(season_string, progress_callback=None, workers=DEFAULT_WORKERS, incremental=False, failed=None):
+    season_path = store.season_path(season_string)
+    collection_url = f"https://www.vogue.com/fashion-shows/{season_string}"
+
+    show_links = get_show_links(collection_url)
+
+    scraped_urls = set()
+    if incremental:
+        for show in store.iter_shows(season_path):
+            scraped_urls.add(show['collection_url'])
+            show['stored'] = True
+            yield show
+
+    # new links first, then earlier failures the link discovery did not find again
+    to_fetch = [show for show in show_links if show['url'] not in scraped_urls]
+    if incremental:
+        # earlier failures keep counting their attempts; the ones that failed too often are
+        # not fetched again but stay recorded, so they are not mistaken for new links either
+        earlier = {show['url']: show for show in load_failed_shows(season_path)
+                   if show['url'] not in scraped_urls}
+        given_up = {url for url, show in earlier.items() if show.get('attempts', 1) >= MAX_FAILED_ATTEMPTS}
+        if failed is not None:
+            failed.extend(earlier[url] for url in given_up)
+        to_fetch = [dict(show, attempts=earlier[show['url']].get('attempts', 1)) if show['url'] in earlier else show
+                    for show in to_fetch if show['url'] not in given_up]
+        queued_urls = {show['url'] for show in to_fetch}
+        for url, show in earlier.items():
+            if url not in queued_urls and url not in given_up:
+                to_fetch.append(dict({key: show.get(key) for key in ('designer', 'url', 'image_url')},
+                                     attempts=show.get('attempts', 1)))
+        print(f"{len(scraped_urls)} shows already saved, fetching {len(to_fetch)}"
+              + (f" ({len(given_up)} failed {MAX_FAILED_ATTEMPTS} times and are skipped)" if given_up else ""))
+
+    yield from iter_scraped_shows(to_fetch, progress_callback=progress_callback, workers=workers, failed=failed)
+
+# scrapes a season into its store (data/<season>_shows.parquet); a thin wrapper over
+# pipeline.run_season_pipeline, which also cleans and counts the shows and holds the
+# season's lock while writing. with incremental=True shows already stored are kept and
+# only new links and shows that failed last time are fetched and appended.
+def run_scraper_for_season(season_string, progress_callback=None, workers=DEFAULT_WORKERS, incremental=False):
+    import pipeline
+
+    season_path, _ = pipeline.run_season_pipeline(season_string, progress_callback, workers=workers,
+                                                  incremental=incremental)
+    return season_path
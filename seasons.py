@@ -0,0 +1,139 @@
+import os, re, json
+from collections import namedtuple
+import store
+
+# metadata file kept inside each season store
+INFO_NAME = '_season.json'
+
+CYCLES = ('resort', 'pre-fall', 'spring', 'fall')
+TYPES = ('ready-to-wear', 'menswear', 'couture')
+TYPE_LABELS = {'ready-to-wear': 'RTW', 'menswear': 'Menswear', 'couture': 'Couture'}
+
+# months after January of the season's year when its collections are shown
+# (spring ready-to-wear 2025 walks in September 2024, fall 2025 in February 2025, ...),
+# so sorting by show date puts every cycle and type on one timeline
+SHOW_MONTHS = {
+    ('resort', 'ready-to-wear'): -8, ('resort', 'menswear'): -8, ('resort', 'couture'): -8,
+    ('pre-fall', 'ready-to-wear'): -1, ('pre-fall', 'menswear'): -1, ('pre-fall', 'couture'): -1,
+    ('spring', 'ready-to-wear'): -4, ('spring', 'menswear'): -7, ('spring', 'couture'): 0,
+    ('fall', 'ready-to-wear'): 1, ('fall', 'menswear'): 0, ('fall', 'couture'): 6,
+}
+
+# vogue season slugs as passed to run_scraper_for_season: spring-2025-ready-to-wear, resort-2025, pre-fall-2024, ...
+SLUG = re.compile(r'^(resort|pre-fall|spring|fall)-(\d{4})(?:-(ready-to-wear|menswear|couture))?$')
+
+
+class Season(namedtuple('Season', 'year cycle type slug')):
+    __slots__ = ()
+
+    # sortable chronological key: months since year 0 at which the collections were shown
+    @property
+    def key(self):
+        return (self.year * 12 + SHOW_MONTHS[self.cycle, self.type], self.slug)
+
+    # e.g. "Spring 2025 RTW"; resort and pre-fall have no separate types on vogue
+    @property
+    def label(self):
+        if self.cycle in ('resort', 'pre-fall'):
+            return f"{self.cycle.title()} {self.year}"
+        return f"{self.cycle.title()} {self.year} {TYPE_LABELS[self.type]}"
+
+
+# parses a season slug, store path or legacy csv path; returns None for names that are not seasons
+def parse(name):
+    slug = os.path.basename(os.path.normpath(name))
+    for suffix in ('_shows.parquet', '_shows.csv'):
+        if slug.endswith(suffix):
+            slug = slug[:-len(suffix)]
+    slug = slug.replace('_', '-').lower()
+    match = SLUG.match(slug)
+    if not match:
+        return None
+    cycle, year, kind = match.groups()
+    return Season(int(year), cycle, kind or 'ready-to-wear', slug)
+
+
+def info_path(season_path):
+    if season_path.endswith('.csv'):
+        return season_path[:-len('.csv')] + '.season.json'
+    return os.path.join(season_path, INFO_NAME)
+
+
+# writes a season's metadata (parsed name and show count) next to its data
+def save_info(season_path, season_string, shows):
+    season = parse(season_string)
+    info = {'slug': season_string, 'shows': shows}
+    if season:
+        info.update(year=season.year, cycle=season.cycle, type=season.type, label=season.label)
+    path = info_path(season_path)
+    with open(path + '.tmp', 'w') as f:
+        json.dump(info, f, indent=2)
+    os.replace(path + '.tmp', path)
+    return info
+
+
+# a season's metadata, falling back to its name when nothing was saved yet
+def load_info(season_path):
+    try:
+        with open(info_path(season_path)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        season = parse(season_path)
+        if season is None:
+            return {'slug': os.path.basename(season_path), 'shows': None}
+        return {'slug': season.slug, 'shows': None, 'year': season.year, 'cycle': season.cycle,
+                'type': season.type, 'label': season.label}
+
+
+def season_of(season_path):
+    info = load_info(season_path)
+    if 'year' not in info:
+        return None
+    return Season(info['year'], info['cycle'], info['type'], info['slug'])
+
+
+# season paths in chronological show order; paths that are not named like a season go last, by name
+def chronological(paths):
+    def key(path):
+        season = season_of(path)
+        return (0, season.key, path) if season else (1, (0, ''), path)
+    return sorted(paths, key=key)
+
+
+# axis label for a season path (its file name when it is not named like a season)
+def label(season_path):
+    info = load_info(season_path)
+    return info.get('label') or info['slug']
+
+
+# parses a year range such as "2018-2025" or "2024" into (first, last)
+def parse_years(text):
+    first, _, last = str(text).partition('-')
+    return int(first), int(last or first)
+
+
+# season stores in a directory matching the filters, in chronological order, e.g.
+# select(types=['ready-to-wear'], years=(2018, 2025)) for "all RTW 2018-2025".
+# only metadata is read, never the shows themselves.
+def select(directory='data', types=None, cycles=None, years=None):
+    paths = store.list_seasons(directory)
+    known = {load_info(p)['slug'] for p in paths}
+    # legacy csv seasons that were not migrated yet
+    for path in sorted(os.listdir(directory)) if os.path.isdir(directory) else []:
+        season = parse(path)
+        if path.endswith('_shows.csv') and season and season.slug not in known:
+            paths.append(os.path.join(directory, path))
+
+    selected = []
+    for path in paths:
+        season = season_of(path)
+        if season is None:
+            continue
+        if types and season.type not in types:
+            continue
+        if cycles and season.cycle not in cycles:
+            continue
+        if years and not years[0] <= season.year <= years[1]:
+            continue
+        selected.append(path)
+    return chronological(selected)
@@ -0,0 +1,224 @@
+import os, csv, glob, shutil, threading
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+# column names used in the season store for each scraped field
+COLUMNS = {
+    'designer': 'Designer',
+    'collection_name': 'Collection Name',
+    'collection_url': 'URL',
+    'cover_image': 'Cover Image',
+    'review': 'Review',
+    'cleaned_review': 'Cleaned Review',
+}
+
+SCHEMA = pa.schema([(column, pa.string()) for column in COLUMNS.values()])
+
+# review text compresses very well, zstd keeps reads fast
+COMPRESSION = 'zstd'
+
+# rows buffered by ShowWriter before they are written out as a new part file
+DEFAULT_BATCH = 25
+
+# a season is compacted into one part file once it has more parts than this
+MAX_PARTS = 8
+
+
+# a season is a directory of parquet part files: data/<season>_shows.parquet/part-00000.parquet, ...
+# new shows are appended as new parts, so existing data is never rewritten.
+def season_path(season_string, directory='data'):
+    return os.path.join(directory, f"{season_string.replace('-', '_')}_shows.parquet")
+
+
+# data/<season>_shows.csv a season was saved to before the stores existed
+def legacy_path(path):
+    return path[:-len('.parquet')] + '.csv'
+
+
+# every season store in a directory
+def list_seasons(directory='data'):
+    return sorted(glob.glob(os.path.join(directory, '*_shows.parquet')))
+
+
+def part_files(path):
+    return sorted(glob.glob(os.path.join(path, 'part-*.parquet')))
+
+
+def _next_part(path):
+    parts = part_files(path)
+    last = int(os.path.basename(parts[-1])[5:10]) if parts else -1
+    return os.path.join(path, f"part-{last + 1:05d}.parquet")
+
+
+# writes a table as the next part file; the temp name keeps it invisible until complete
+def _write_part(path, table):
+    os.makedirs(path, exist_ok=True)
+    part = _next_part(path)
+    tmp = os.path.join(path, f".{os.path.basename(part)}.tmp")
+    pq.write_table(table, tmp, compression=COMPRESSION)
+    os.replace(tmp, part)
+    return part
+
+
+def _to_table(rows):
+    return pa.Table.from_pylist([{column: row.get(column) for column in COLUMNS.values()} for row in rows],
+                                schema=SCHEMA)
+
+
+# reads a season as a DataFrame, loading only the requested columns.
+# legacy csv seasons are read too, so callers do not care which layout a path uses.
+def read_shows(path, columns=None):
+    import pandas as pd
+
+    if path.endswith('.csv'):
+        header = pd.read_csv(path, nrows=0).columns
+        usecols = [c for c in columns if c in header] if columns else None
+        df = pd.read_csv(path, usecols=usecols)
+        for column in columns or []:
+            if column not in df:
+                df[column] = None
+        return df[columns] if columns else df
+
+    parts = part_files(path)
+    if not parts:
+        return pd.DataFrame(columns=columns or list(COLUMNS.values()))
+    return pq.read_table(parts, columns=columns, schema=SCHEMA).to_pandas()
+
+
+# streams a season back as the dicts returned by scraper.scrape_show_page
+def iter_shows(path):
+    if path.endswith('.csv'):
+        if os.path.exists(path):
+            with open(path, newline='', encoding='utf-8') as f:
+                for row in csv.DictReader(f):
+                    yield {key: row.get(column) or None for key, column in COLUMNS.items()}
+        return
+
+    for part in part_files(path):
+        for batch in pq.ParquetFile(part).iter_batches():
+            for row in batch.to_pylist():
+                yield {key: row.get(column) for key, column in COLUMNS.items()}
+
+
+# appends shows (dicts keyed like scrape_show_page results) as one new part file
+def append_shows(path, shows):
+    shows = list(shows)
+    if shows:
+        _write_part(path, _to_table([{COLUMNS[key]: show.get(key) for key in COLUMNS} for show in shows]))
+
+
+# merges every part of a season into a single part file
+def compact(path):
+    parts = part_files(path)
+    if len(parts) < 2:
+        return
+    table = pq.read_table(parts, schema=SCHEMA)
+    merged = os.path.join(path, '.compact.parquet.tmp')
+    pq.write_table(table, merged, compression=COMPRESSION)
+    for part in parts:
+        os.remove(part)
+    os.replace(merged, parts[0])
+
+
+# appends shows to a season store as they arrive, a batch of rows per part file.
+# with replace=True the parts are staged in a separate directory that only
+# replaces the season on commit, so a crash or cancelled run keeps the old data;
+# otherwise each batch is appended to the season as soon as it is written.
+class ShowWriter:
+    def __init__(self, path, replace=False, batch=DEFAULT_BATCH):
+        self.path = path
+        self.replace = replace
+        self.target = path + '.staging' if replace else path
+        self.batch = batch
+        self.buffer = []
+        self.rows = 0
+        self.lock = threading.Lock()
+        if replace and os.path.exists(self.target):
+            shutil.rmtree(self.target)
+        os.makedirs(self.target, exist_ok=True)
+
+    def append(self, show):
+        with self.lock:
+            self.buffer.append(show)
+            self.rows += 1
+            if len(self.buffer) >= self.batch:
+                self.flush()
+
+    def flush(self):
+        if self.buffer:
+            append_shows(self.target, self.buffer)
+            self.buffer = []
+
+    def commit(self):
+        with self.lock:
+            self.flush()
+        if self.replace:
+            old = self.path + '.old'
+            if os.path.exists(self.path):
+                os.replace(self.path, old)
+            os.replace(self.target, self.path)
+            if os.path.exists(old):
+                shutil.rmtree(old)
+        if len(part_files(self.path)) > MAX_PARTS:
+            compact(self.path)
+        print(f"Data saved to {self.path}")
+
+    def abort(self):
+        if self.replace:
+            shutil.rmtree(self.target, ignore_errors=True)
+        else:
+            with self.lock:
+                self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.commit()
+        else:
+            self.abort()
+
+
+# converts a legacy data/<season>_shows.csv into a season store next to it,
+# cleaning any reviews that were never cleaned. returns the store path.
+def migrate_csv(csv_path, remove=False):
+    import pandas as pd
+    from analyze import clean_text
+
+    df = pd.read_csv(csv_path, dtype=str)
+    if 'Cleaned Review' not in df:
+        df['Cleaned Review'] = None
+    missing = df['Cleaned Review'].isna() & df['Review'].notna()
+    df.loc[missing, 'Cleaned Review'] = df.loc[missing, 'Review'].apply(clean_text)
+
+    path = csv_path[:-len('.csv')] + '.parquet'
+    staging = path + '.staging'
+    shutil.rmtree(staging, ignore_errors=True)
+    df = df.astype(object).where(df.notna(), None)
+    _write_part(staging, _to_table(df.to_dict('records')))
+    if os.path.exists(path):
+        shutil.rmtree(path)
+    os.replace(staging, path)
+
+    # failed shows move into the store along with the data
+    failed = csv_path.replace('_shows.csv', '_failed.json')
+    if os.path.exists(failed):
+        os.replace(failed, os.path.join(path, '_failed.json'))
+
+    if remove:
+        os.remove(csv_path)
+    return path
+
+
+# one-shot migration of every legacy season csv in a directory
+def migrate_all(directory='data', remove=False):
+    paths = []
+    for csv_path in sorted(glob.glob(os.path.join(directory, '*_shows.csv'))):
+        paths.append(migrate_csv(csv_path, remove))
+        print(f"Migrated {csv_path} -> {paths[-1]}")
+    return paths
+
+
+if __name__ == "__main__":
+    migrate_all()
@@ -8,4 +8,5 @@ def main():
     #counts1, counts2 = compare_seasons("data/spring_2025_ready_to_wear_shows.csv", "data/spring_2024_ready_to_wear_shows.csv")
     #plot_compared_seasons(counts1, "Spring 2025 RTW", counts2, "Spring 2024 RTW")
 
-main()
\ No newline at end of file
+if __name__ == "__main__":
+    main()
\ No newline at end of file
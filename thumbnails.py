@@ -0,0 +1,133 @@
+import os, hashlib, threading
+from io import BytesIO
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from PIL import Image
+import transport
+
+# resized covers are kept here so a rerun skips downloading and decoding them again
+THUMB_DIR = os.path.join('data', 'cache', 'thumbs')
+
+# size the loading page shows covers at
+THUMB_SIZE = (167, 251)
+
+# decoded thumbnails kept in memory
+DEFAULT_MEMORY_ITEMS = 64
+
+# downloads still queued for older shows are cancelled once this many newer ones were requested
+DEFAULT_WINDOW = 8
+
+
+# fetches, decodes and resizes cover images on a small thread pool.
+# finished thumbnails go into a bounded in-memory LRU and a disk cache of resized jpegs.
+# callbacks run on the worker thread with (url, PIL image or None); the GUI hops back
+# to the Tk thread itself before turning them into PhotoImages.
+class ThumbnailLoader:
+    def __init__(self, workers=4, size=THUMB_SIZE, memory_items=DEFAULT_MEMORY_ITEMS,
+                 window=DEFAULT_WINDOW, directory=THUMB_DIR):
+        self.size = size
+        self.memory_items = memory_items
+        self.window = window
+        self.directory = directory
+        self.pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='thumbnails')
+        self.lock = threading.Lock()
+        self.memory = OrderedDict()
+        self.pending = OrderedDict()
+
+    def _disk_path(self, url):
+        key = hashlib.sha256(f"{url}|{self.size[0]}x{self.size[1]}".encode()).hexdigest()
+        return os.path.join(self.directory, key[:2], key + '.jpg')
+
+    # thumbnail already in memory, or None
+    def cached(self, url):
+        with self.lock:
+            image = self.memory.get(url)
+            if image is not None:
+                self.memory.move_to_end(url)
+            return image
+
+    def _remember(self, url, image):
+        with self.lock:
+            self.memory[url] = image
+            self.memory.move_to_end(url)
+            while len(self.memory) > self.memory_items:
+                self.memory.popitem(last=False)
+
+    def _fetch(self, url):
+        path = self._disk_path(url)
+        try:
+            with Image.open(path) as thumb:
+                image = thumb.convert('RGB')
+        except OSError:
+            response = transport.get(url, timeout=(3, 5))
+            response.raise_for_status()
+            with Image.open(BytesIO(response.content)) as original:
+                image = original.convert('RGB').resize(self.size)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            image.save(path + '.tmp', 'JPEG', quality=85)
+            os.replace(path + '.tmp', path)
+        self._remember(url, image)
+        return image
+
+    # starts loading url (if it is not cached or already loading) and returns its future.
+    # queued loads that fell more than `window` requests behind are cancelled.
+    def _submit(self, url):
+        with self.lock:
+            future = self.pending.get(url)
+            started = future is None
+            if started:
+                future = self.pool.submit(self._fetch, url)
+                self.pending[url] = future
+            self.pending.move_to_end(url)
+            stale = list(self.pending.values())[:-self.window]
+        # added outside the lock, since it runs right away if the load already finished
+        if started:
+            future.add_done_callback(lambda done: self._done(url, done))
+        for old in stale:
+            old.cancel()
+        return future
+
+    def _done(self, url, future):
+        with self.lock:
+            if self.pending.get(url) is future:
+                del self.pending[url]
+
+    # warms the caches for a cover that is about to be shown
+    def prefetch(self, url):
+        if url and self.cached(url) is None:
+            self._submit(url)
+
+    # calls callback(url, image) once the thumbnail is ready (right away when cached);
+    # image is None when the cover could not be loaded. cancelled loads never call back.
+    def load(self, url, callback):
+        image = self.cached(url)
+        if image is not None:
+            callback(url, image)
+            return
+
+        def finished(future):
+            if future.cancelled():
+                return
+            try:
+                image = future.result()
+            except Exception as e:
+                print(f"Could not load cover image {url}: {e}")
+                image = None
+            callback(url, image)
+
+        self._submit(url).add_done_callback(finished)
+
+    def close(self):
+        self.pool.shutdown(wait=False, cancel_futures=True)
+
+
+_loader = None
+_loader_lock = threading.Lock()
+
+# returns the process-wide loader, started on first use
+def get_loader():
+    global _loader
+    with _loader_lock:
+        if _loader is None:
+            _loader = ThumbnailLoader()
+        return _loader
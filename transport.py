@@ -0,0 +1,158 @@
+import os, time, threading
+from collections import deque, namedtuple
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from urllib3.util.retry import Retry
+import http_cache
+
+HEADERS = {'User-Agent': 'Mozilla/5.0'}
+
+# (connect, read) timeouts in seconds used when the caller gives none
+DEFAULT_TIMEOUT = (5, 20)
+
+# statuses retried by the session before the response is handed back
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+# requests/urllib3 only decode brotli bodies when a brotli package is installed
+try:
+    import brotli  # noqa: F401
+    ACCEPT_ENCODING = 'gzip, deflate, br'
+except ImportError:
+    ACCEPT_ENCODING = 'gzip, deflate'
+
+# one entry per finished request (cached is True when no body came over the network)
+RequestMetrics = namedtuple('RequestMetrics', ['url', 'status', 'bytes', 'wire_bytes', 'latency', 'retries', 'cached'])
+
+# in offline mode every request is served from the on-disk cache or fails with CacheMiss
+OFFLINE = os.environ.get('FASHION_OFFLINE', '') not in ('', '0')
+
+_session = None
+_session_lock = threading.Lock()
+_metrics = deque(maxlen=1000)
+_listeners = []
+
+
+# builds a pooled keep-alive session with bounded, jittered retries
+def make_session(pool_size=16, retries=3, backoff=0.5, jitter=0.5):
+    retry = Retry(
+        total=retries,
+        connect=retries,
+        read=retries,
+        status=retries,
+        backoff_factor=backoff,
+        backoff_jitter=jitter,
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=frozenset(['GET', 'HEAD']),
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+
+    session = requests.Session()
+    session.headers.update(HEADERS)
+    session.headers['Accept-Encoding'] = ACCEPT_ENCODING
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+# returns the process-wide session, creating it on first use
+def get_session():
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = make_session()
+        return _session
+
+
+# registers fn(metrics) to be called after every request
+def add_metrics_listener(fn):
+    _listeners.append(fn)
+
+
+def remove_metrics_listener(fn):
+    if fn in _listeners:
+        _listeners.remove(fn)
+
+
+def set_offline(offline=True):
+    global OFFLINE
+    OFFLINE = offline
+
+
+# metrics of the most recent requests, oldest first
+def recent_metrics():
+    return list(_metrics)
+
+
+# number of retries urllib3 made before returning this response
+def retry_count(response):
+    retries = getattr(response.raw, 'retries', None)
+    return len(retries.history) if retries is not None else 0
+
+
+# True when get(url) would be answered from disk without touching the network
+def is_cached(url):
+    entry = http_cache.get_cache().lookup(url)
+    return entry is not None and (OFFLINE or http_cache.get_cache().is_fresh(entry))
+
+
+# builds a response object around a cached body
+def _cached_response(url, entry, body):
+    response = requests.Response()
+    response.status_code = entry['status']
+    response.url = url
+    response._content = body
+    response.headers = CaseInsensitiveDict(
+        {name: entry[name] for name in http_cache.KEPT_HEADERS if name in entry})
+    response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+    response.from_cache = True
+    return response
+
+
+def _record(url, response, start, cached):
+    body = response.content
+    latency = time.perf_counter() - start
+    wire_bytes = 0 if cached else getattr(response.raw, 'tell', lambda: len(body))()
+    record = RequestMetrics(url, response.status_code, len(body), wire_bytes, latency,
+                            retry_count(response), cached)
+    _metrics.append(record)
+    for fn in list(_listeners):
+        fn(record)
+
+
+# GET through the shared session, recording bytes, latency and retries.
+# with cache=True fresh entries are served from disk, stale ones are
+# revalidated with ETag/Last-Modified and 200 responses are stored.
+# revalidate=True revalidates even fresh entries (for pages that change often);
+# offline, the cached copy is still served.
+def get(url, timeout=DEFAULT_TIMEOUT, cache=True, revalidate=False, **kwargs):
+    start = time.perf_counter()
+    store = http_cache.get_cache() if cache else None
+    entry = store.lookup(url) if store else None
+
+    if entry and (OFFLINE or not revalidate and store.is_fresh(entry)):
+        store.touch(url, entry)
+        response = _cached_response(url, entry, store.read_body(entry))
+        _record(url, response, start, True)
+        return response
+    if OFFLINE:
+        raise http_cache.CacheMiss(url)
+
+    headers = dict(kwargs.pop('headers', None) or {})
+    if entry:
+        headers.update(store.validators(entry))
+
+    response = get_session().get(url, timeout=timeout, headers=headers, **kwargs)
+
+    if store and entry and response.status_code == 304:
+        store.touch(url, entry, refresh=True)
+        revalidated = _cached_response(url, entry, store.read_body(entry))
+        _record(url, response, start, False)
+        return revalidated
+
+    if store and response.status_code == 200:
+        store.store(url, response.status_code, response.headers, response.content)
+    _record(url, response, start, False)
+    return response
@@ -1,64 +1,142 @@
 import pandas as pd
 import glob, os
-import matplotlib.pyplot as plt
-from analyze import get_counts
+from analyze import count_matrices_parallel, CountMatrix, VOCABULARY
 from collections import Counter
 import numpy as np
+import seasons, trend_stats
+
+# least-squares slope of every row of an items x seasons matrix, all rows at once.
+# x is centred (and doubled to stay integral), so integer counts give exact sums
+# and a slope sitting on the threshold is not nudged across it by rounding.
+def trend_slopes(values):
+    values = np.asarray(values)
+    n_seasons = values.shape[1]
+    if n_seasons < 2:
+        return np.zeros(len(values))
+    x = 2 * np.arange(n_seasons) - (n_seasons - 1)
+    return 2 * (values @ x) / (x @ x)
+
+# Rising/Steady/Declining label for every row of an items x seasons matrix
+def classify_trends(values):
+    slopes = trend_slopes(values)
+    return np.where(slopes > 0.1, "Rising", np.where(slopes < -0.1, "Declining", "Steady"))
 
 def classify_trend(values):
-    values = [int(v) for v in values]
-    if len(values) < 2:
-        return "Steady"
-    slope = np.polyfit(range(len(values)), values, 1)[0]
-    if slope > 0.1:
-        return "Rising"
-    elif slope < -0.1:
-        return "Declining"
-    else:
-        return "Steady"
-
-def get_clean_rev(csv_path):
-    """
-    Reads the Cleaned Review column from a CSV and returns as a single string.
-    """
-    df = pd.read_csv(csv_path)
-    clean_review = ' '.join([str(r) for r in df['Cleaned Review'].dropna()])
-    return clean_review
-
-def analyze_trends(file_pattern_or_list, category):
-    # Determine input type
+    return str(classify_trends([[int(v) for v in values]])[0])
+
+# items x seasons matrix of one category's mentions, built once per analysis.
+# returns the item names (row order) and the matrix.
+def trend_matrix(season_order, category):
+    items = sorted(set().union(*(counts.get(category, Counter()) for counts in season_order)))
+    index = {item: i for i, item in enumerate(items)}
+    values = np.zeros((len(items), len(season_order)), dtype=np.int64)
+    for s, counts in enumerate(season_order):
+        cat_counts = counts.get(category, Counter())
+        if cat_counts:
+            values[[index[item] for item in cat_counts], s] = list(cat_counts.values())
+    return items, values
+
+# resolves a glob pattern, data directory or list into season paths in chronological order.
+# a list may also hold analyze.CountMatrix objects, which are taken to be in season order already.
+# raises ValueError when a pattern or directory matches no season files.
+def season_files(file_pattern_or_list):
     if isinstance(file_pattern_or_list, list):
         files = file_pattern_or_list
+    elif os.path.isdir(file_pattern_or_list) and not file_pattern_or_list.endswith(".parquet"):
+        # stored seasons, plus legacy csvs only for seasons that were not migrated yet;
+        # stores and csvs not named like a season are taken as they are and go last
+        directory = file_pattern_or_list
+        unnamed = [f for pattern in ("*_shows.parquet", "*.csv")
+                   for f in glob.glob(os.path.join(directory, pattern)) if seasons.season_of(f) is None]
+        files = seasons.select(directory) + sorted(unnamed)
     else:
+        # a legacy csv the pattern also matched the migrated store of is the same season
         files = glob.glob(file_pattern_or_list)
-        if os.path.isdir(file_pattern_or_list):
-            files = glob.glob(os.path.join(file_pattern_or_list, "*.csv"))
-
-    files.sort()
-    season_order = []
-    all_items = set()
-
-    for f in files:
-        review = get_clean_rev(f)
-        counts = get_counts(review)
-        season_order.append(counts)
-        cat_counts = counts.get(category, Counter())
-        all_items.update(cat_counts.keys())
-
-    trends = {}
-    for item in all_items:
-        values = [sum(cat_counts.get(item, 0) for cat_counts in counts.values())
-                  for counts in season_order]
-        trends[item] = classify_trend(values)
+        stores = set(files)
+        files = [f for f in files if not (f.endswith("_shows.csv") and
+                                          f[:-len(".csv")] + ".parquet" in stores)]
+    if not files and not isinstance(file_pattern_or_list, list):
+        raise ValueError(f"no season files match {file_pattern_or_list}")
+
+    if all(isinstance(f, str) for f in files):
+        files = seasons.chronological(files)
+    return files
+
+# x-axis labels for the resolved season files, e.g. "Fall 2024 RTW"
+def season_labels(files):
+    return [seasons.label(f) if isinstance(f, str) else str(i + 1) for i, f in enumerate(files)]
+
+# count matrices of the resolved season files, counted up front and sharded across processes
+def load_season_matrices(files, workers=1):
+    paths = [f for f in files if not isinstance(f, CountMatrix)]
+    file_matrices = dict(zip(paths, count_matrices_parallel(paths, workers)))
+    return [f if isinstance(f, CountMatrix) else file_matrices[f] for f in files]
+
+def _score_category(matrices, category, per, method, alpha, season_order=None):
+    if season_order is None:
+        season_order = [m.to_counts() for m in matrices]
+    items, values = trend_matrix(season_order, category)
+    shows, tokens = trend_stats.season_exposure(matrices)
+    scores = trend_stats.score_trends(values, shows, tokens, per, method, alpha)
+    return items, scores, season_order
+
+# workers: processes used to count the season files (all cores when None, serial when 1)
+# per: mentions are compared per 'show', per 10k review 'tokens' or as raw counts (None)
+# method: 'mann-kendall' or 'ols' (mann-kendall needs 5 seasons, fewer are tested with ols);
+# a trend is Rising/Declining only when its p-value is below alpha
+def analyze_trends(file_pattern_or_list, category, workers=1, per='show', method='mann-kendall',
+                   alpha=trend_stats.DEFAULT_ALPHA):
+    matrices = load_season_matrices(season_files(file_pattern_or_list), workers)
+    items, scores, season_order = _score_category(matrices, category, per, method, alpha)
+    trends = dict(zip(items, scores['trend'].tolist()))
 
     return trends, season_order
 
-def plot_trends(trends, season_order, category):
+# effect sizes and p-values of every item of a category, most significant first
+def trend_table(file_pattern_or_list, category, workers=1, per='show', method='mann-kendall',
+                alpha=trend_stats.DEFAULT_ALPHA):
+    matrices = load_season_matrices(season_files(file_pattern_or_list), workers)
+    items, scores, _ = _score_category(matrices, category, per, method, alpha)
+    return pd.DataFrame(scores, index=pd.Index(items, name='item')).sort_values('p_value')
+
+# scores every vocabulary term over the seasons in one pass (terms never mentioned are left out)
+def vocabulary_trends(file_pattern_or_list, workers=1, per='show', method='mann-kendall',
+                      alpha=trend_stats.DEFAULT_ALPHA):
+    matrices = load_season_matrices(season_files(file_pattern_or_list), workers)
+    values = np.column_stack([m.totals() for m in matrices])
+    shows, tokens = trend_stats.season_exposure(matrices)
+    scores = trend_stats.score_trends(values, shows, tokens, per, method, alpha)
+    mentioned = values.any(axis=1)
+    table = pd.DataFrame(scores, index=pd.Index(VOCABULARY, name='term'))[mentioned]
+    return table.sort_values('p_value')
+
+# y-axis label of the rates each normalization gives
+RATE_LABELS = {'show': "Mentions per Show", 'tokens': f"Mentions per {trend_stats.TOKENS_PER_RATE:,} Words",
+               None: "Mentions"}
+
+# labels: one x-axis label per season (season numbers when omitted)
+# fig: a matplotlib Figure to draw into (cleared first), e.g. one embedded in a window;
+# a new pyplot figure is made when omitted
+# matrices, per: the seasons' count matrices and the normalization the trends were scored with,
+# so the lines show the same rates the test saw (raw counts when matrices are omitted)
+# returns the figure; show=True also opens it in a window
+def plot_trends(trends, season_order, category, labels=None, show=False, fig=None, matrices=None, per='show'):
     categories = ['Rising', 'Steady', 'Declining']
     colors = {'Rising': 'green', 'Steady': 'gray', 'Declining': 'red'}
     n_seasons = len(season_order)
+    names, values = trend_matrix(season_order, category)
+    if matrices is None:
+        per = None
+    else:
+        shows, tokens = trend_stats.season_exposure(matrices)
+        values = trend_stats.normalize(values, shows, tokens, per)
+    rows = {item: i for i, item in enumerate(names)}
 
-    fig, axes = plt.subplots(1, 3, figsize=(20, 6), sharex=False)
+    if fig is None:
+        import matplotlib.pyplot as plt
+        fig = plt.figure(figsize=(20, 6))
+    fig.clear()
+    axes = fig.subplots(1, 3, sharex=False)
 
     for ax, cat in zip(axes, categories):
         items = [item for item, trend_type in trends.items() if trend_type == cat]
@@ -68,27 +146,20 @@ def plot_trends(trends, season_order, category):
             ax.axis("off")
             continue
 
-        # compute total mentions for each item to select top 5
-        total_mentions = {}
-        for item in items:
-            total_mentions[item] = sum(sum(cat_counts.get(item, 0) for cat_counts in counts.values())
-                                       for counts in season_order)
+        # compute total mentions (or rates) for each item to select top 5
+        total_mentions = {item: values[rows[item]].sum() for item in items}
 
         top_items = sorted(total_mentions.items(), key=lambda x: x[1], reverse=True)[:5]
 
         # sort last points to prevent overlapping labels
-        last_points = []
-        for item, _ in top_items:
-            y = [sum(cat_counts.get(item, 0) for cat_counts in counts.values())
-                 for counts in season_order]
-            last_points.append((item, y[-1]))
+        last_points = [(item, values[rows[item], -1]) for item, _ in top_items]
         last_points.sort(key=lambda x: x[1])
-        offset_step = max(1, max([lp[1] for lp in last_points]) * 0.02)
+        top = max(values[rows[item]].max() for item, _ in last_points)
+        offset_step = max(1 if per is None else 0, top * 0.02)
 
         max_count = 0
         for i, (item, last_y) in enumerate(last_points):
-            y = [sum(cat_counts.get(item, 0) for cat_counts in counts.values())
-                 for counts in season_order]
+            y = values[rows[item]]
             x = np.arange(1, n_seasons+1)
             max_count = max(max_count, max(y, default=0))
 
@@ -103,31 +174,77 @@ def plot_trends(trends, season_order, category):
             )
 
         ax.set_title(f"{cat} Trends (Top 5)")
-        ax.set_ylabel("Mentions")
-        ax.set_ylim(0, max_count + 1)
+        ax.set_ylabel(RATE_LABELS[per])
+        ax.set_ylim(0, max_count + 1 if per is None else (max_count * 1.1 or 1))
         ax.grid(True, linestyle='--', alpha=0.5)
         ax.set_xticks(np.arange(1, n_seasons+1))
-        ax.set_xticklabels([str(i) for i in range(1, n_seasons+1)])
-        ax.set_xlabel("Seasons Index")
+        if labels:
+            ax.set_xticklabels(labels, rotation=45, ha='right', fontsize=8)
+            ax.set_xlabel("Season")
+        else:
+            ax.set_xticklabels([str(i) for i in range(1, n_seasons+1)])
+            ax.set_xlabel("Seasons Index")
         fig.suptitle(category.capitalize() + ' Trends Across ' + str(n_seasons) + ' Seasons', 
                    fontsize = 14, y = 0.99)
 
-    plt.tight_layout()
-    plt.show()
-
-
-def run_fashion_trend_analysis(file_pattern_or_list, category):
+    fig.tight_layout()
+    if show:
+        import matplotlib.pyplot as plt
+        plt.show()
+    return fig
+
+
+# trends of one set of seasons in any category. the seasons are counted once up front;
+# every category is then scored from the same count matrices and remembered, so
+# switching categories does not touch the season files again.
+class SeasonTrends:
+    def __init__(self, file_pattern_or_list, workers=1, per='show', method='mann-kendall',
+                 alpha=trend_stats.DEFAULT_ALPHA):
+        self.files = season_files(file_pattern_or_list)
+        self.labels = season_labels(self.files)
+        self.matrices = load_season_matrices(self.files, workers)
+        self.season_order = [m.to_counts() for m in self.matrices]
+        self.per, self.method, self.alpha = per, method, alpha
+        self.tables = {}
+
+    # same table as trend_table()
+    def table(self, category):
+        if category not in self.tables:
+            items, scores, _ = _score_category(self.matrices, category, self.per, self.method,
+                                               self.alpha, self.season_order)
+            self.tables[category] = pd.DataFrame(scores, index=pd.Index(items, name='item')).sort_values('p_value')
+        return self.tables[category]
+
+    # item -> Rising/Steady/Declining
+    def trends(self, category):
+        return self.table(category)['trend'].to_dict()
+
+    def plot(self, category, fig=None):
+        return plot_trends(self.trends(category), self.season_order, category, self.labels, fig=fig,
+                           matrices=self.matrices, per=self.per)
+
+
+def run_fashion_trend_analysis(file_pattern_or_list, category, workers=1, per='show', method='mann-kendall'):
     """
     Wrapper function: analyze trends for a specific category and plot results.
     Parameters:
-        file_pattern_or_list: list of CSV paths or a glob pattern like 'data/*.csv'
+        file_pattern_or_list: list of season paths or a glob pattern like 'data/*_shows.parquet',
+            e.g. seasons.select(types=['ready-to-wear'], years=(2018, 2025)); seasons are put in
+            chronological order
         category: string, e.g. 'colors', 'patterns', 'fabrics', etc.
+        workers: processes used to count the season files (None for all cores)
+        per: normalize mentions per 'show', per 10k review 'tokens', or None for raw counts
+        method: 'mann-kendall' or 'ols' trend test (below 5 seasons mann-kendall falls back to ols)
     Returns:
         trends: dict mapping item -> trend type
         season_order: list of counts per season
     """
-    trends, season_order = analyze_trends(file_pattern_or_list, category)
-    plot_trends(trends, season_order, category)
-    return trends, season_order
-
-run_fashion_trend_analysis("data/*.csv", "colors")
+    season_trends = SeasonTrends(file_pattern_or_list, workers, per, method)
+    trends = season_trends.trends(category)
+    plot_trends(trends, season_trends.season_order, category, season_trends.labels, show=True,
+                matrices=season_trends.matrices, per=per)
+    return trends, season_trends.season_order
+
+# demo run; only when run as a script, so cli.py and gui.py can import this module
+if __name__ == "__main__":
+    run_fashion_trend_analysis("data/*_shows.parquet", "colors")
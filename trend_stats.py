@@ -0,0 +1,127 @@
+import numpy as np
+from scipy.special import ndtr, stdtr
+
+# rates are reported per show or per this many review tokens
+TOKENS_PER_RATE = 10000
+
+# significance level below which a trend is labelled Rising/Declining
+DEFAULT_ALPHA = 0.05
+
+# fewest seasons each test can call a trend significant with at DEFAULT_ALPHA.
+# even a perfectly monotonic series gives Mann-Kendall p = 0.296 over 3 seasons
+# and p = 0.089 over 4, while a least-squares fit can already reach p < 0.05 over 3
+MIN_SEASONS = {'mann-kendall': 5, 'ols': 3}
+
+
+# per-season exposure of a list of analyze.CountMatrix: (shows, review tokens)
+def season_exposure(matrices):
+    shows = np.array([m.shows for m in matrices], dtype=float)
+    tokens = np.array([m.lengths.sum() for m in matrices], dtype=float)
+    return shows, tokens
+
+
+# turns an items x seasons count matrix into mention rates, so seasons with
+# more shows or longer reviews do not look like everything is rising.
+# per: 'show' (mentions per show), 'tokens' (per 10k tokens) or None (raw counts)
+def normalize(values, shows=None, tokens=None, per='show'):
+    values = np.asarray(values, dtype=float)
+    if per is None:
+        return values
+    if per == 'show':
+        exposure = shows
+    elif per == 'tokens':
+        exposure = None if tokens is None else np.asarray(tokens, dtype=float) / TOKENS_PER_RATE
+    else:
+        raise ValueError(f"unknown normalization: {per!r}")
+    if exposure is None:
+        raise ValueError(f"normalizing per {per} needs the season exposure")
+    exposure = np.asarray(exposure, dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(exposure > 0, values / exposure, 0.0)
+
+
+# least-squares trend of every row at once: slope per season and its two-sided p-value
+def ols(rates):
+    rates = np.asarray(rates, dtype=float)
+    n_items, n = rates.shape
+    if n < 3:
+        return np.zeros(n_items), np.ones(n_items)
+    x = np.arange(n) - (n - 1) / 2
+    sxx = x @ x
+    slope = rates @ x / sxx
+    residuals = rates - rates.mean(axis=1, keepdims=True) - np.outer(slope, x)
+    stderr = np.sqrt((residuals ** 2).sum(axis=1) / (n - 2) / sxx)
+    # a perfect fit gives an infinite t (p = 0); a flat series gives 0/0, which is no trend
+    with np.errstate(divide='ignore', invalid='ignore'):
+        t = slope / stderr
+    t[np.isnan(t)] = 0.0
+    p = 2 * stdtr(n - 2, -np.abs(t))
+    return slope, p
+
+
+# Mann-Kendall trend test with Sen's slope for every row at once.
+# rank based, so a single outlier season does not decide the trend.
+# returns Sen's slope per season, the tie-corrected two-sided p-value and Kendall's tau.
+def mann_kendall(rates):
+    rates = np.asarray(rates, dtype=float)
+    n_items, n = rates.shape
+    if n < 3:
+        return np.zeros(n_items), np.ones(n_items), np.zeros(n_items)
+
+    i, j = np.triu_indices(n, 1)
+    diffs = rates[:, j] - rates[:, i]
+    s = np.sign(diffs).sum(axis=1)
+
+    # each value's tie group size t contributes (t-1)(2t+5) once per member
+    ties = (rates[:, :, None] == rates[:, None, :]).sum(axis=2)
+    tie_term = ((ties - 1) * (2 * ties + 5)).sum(axis=1)
+    variance = (n * (n - 1) * (2 * n + 5) - tie_term) / 18.0
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        z = np.where(variance > 0, (s - np.sign(s)) / np.sqrt(variance), 0.0)
+    p = 2 * ndtr(-np.abs(z))
+    tau = s / len(i)
+    sen = np.median(diffs / (j - i), axis=1)
+    return sen, p, tau
+
+
+# labels every row Rising/Declining when its trend is significant, Steady otherwise
+def classify(slopes, p_values, alpha=DEFAULT_ALPHA):
+    significant = np.asarray(p_values) < alpha
+    slopes = np.asarray(slopes)
+    return np.where(significant & (slopes > 0), "Rising",
+                    np.where(significant & (slopes < 0), "Declining", "Steady"))
+
+
+# the test used for method over n_seasons seasons: Mann-Kendall falls back to
+# least squares below its minimum, where it could never label anything
+def trend_test(method, n_seasons):
+    if method == 'mann-kendall' and n_seasons < MIN_SEASONS['mann-kendall']:
+        return 'ols'
+    return method
+
+
+# fewest seasons over which method (with its fallback) can label a trend at all
+def min_seasons(method='mann-kendall'):
+    return MIN_SEASONS[trend_test(method, 0)]
+
+
+# scores an items x seasons count matrix in one pass.
+# method: 'mann-kendall' (Sen's slope) or 'ols'; see trend_test() for short series.
+# returns a dict of per-item arrays: mean rate, slope per season, relative change
+# per season (slope / mean rate), p-value and trend label.
+def score_trends(values, shows=None, tokens=None, per='show', method='mann-kendall', alpha=DEFAULT_ALPHA):
+    rates = normalize(values, shows, tokens, per)
+    method = trend_test(method, rates.shape[1])
+    if method == 'mann-kendall':
+        slope, p, _ = mann_kendall(rates)
+    elif method == 'ols':
+        slope, p = ols(rates)
+    else:
+        raise ValueError(f"unknown trend method: {method!r}")
+
+    mean = rates.mean(axis=1) if rates.shape[1] else np.zeros(len(rates))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        relative = np.where(mean > 0, slope / mean, 0.0)
+    return {'rate': mean, 'slope': slope, 'relative_slope': relative,
+            'p_value': p, 'trend': classify(slope, p, alpha)}